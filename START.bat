@@ -282,7 +282,6 @@ IF ERRORLEVEL 1 (
     pip install requests
     pip install Pillow
     pip install PyMuPDF
-    pip install pandas
     pip install pytesseract
     pip install openpyxl
     
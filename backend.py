@@ -3,24 +3,111 @@
 # Date: 2025-07-19
 # Version: 30.2.0
 
+import os
 import uuid
-import threading
+import shutil
+import atexit
 import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from processing_engine import process_files
 
 # --- Job Management ---
 
-# A dictionary to store the status of background jobs.
+class ShardedJobStore:
+    """
+    Dict-like store for job status, split into lock-striped shards.
+    
+    Each job ID maps to one shard, so status polls and worker updates on
+    different jobs never wait on the same lock.
+    """
+    def __init__(self, n=16):
+        # Shard count must be a power of two so a bitmask picks the shard.
+        if n < 1 or n & (n - 1):
+            raise ValueError("Shard count must be a power of two.")
+        self._mask = n - 1
+        self._shards = [{} for _ in range(n)]
+        self._locks = [threading.RLock() for _ in range(n)]
+        
+    def _index(self, job_id):
+        return hash(job_id) & self._mask
+        
+    @contextmanager
+    def shard_for(self, job_id):
+        """Hold the lock for the shard owning job_id and yield that shard."""
+        i = self._index(job_id)
+        with self._locks[i]:
+            yield self._shards[i]
+            
+    def __getitem__(self, job_id):
+        with self.shard_for(job_id) as shard:
+            return shard[job_id]
+            
+    def __setitem__(self, job_id, value):
+        with self.shard_for(job_id) as shard:
+            shard[job_id] = value
+            
+    def __contains__(self, job_id):
+        with self.shard_for(job_id) as shard:
+            return job_id in shard
+            
+    def get(self, job_id, default=None):
+        with self.shard_for(job_id) as shard:
+            return shard.get(job_id, default)
+            
+    def update(self, other=(), **kwargs):
+        for job_id, value in dict(other, **kwargs).items():
+            self[job_id] = value
+
+# Stores the status of background jobs.
 # In a real-world multi-user app, this would be a database or a more robust store.
-jobs = {}
+jobs = ShardedJobStore()
 logger = logging.getLogger(__name__)
 
-def start_processing_job(filepaths):
+# Maximum number of log messages kept per job; older ones are dropped
+MAX_JOB_LOG = 10_000
+
+# Bounded worker pool shared by all jobs, so burst submissions queue up
+# instead of each spawning a new thread.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="kyoqa"
+)
+atexit.register(_EXECUTOR.shutdown, wait=False)
+
+def _check_job_failure(job_id, future):
+    """
+    Done-callback that marks a job as failed if its worker raised.
+    
+    process_files() handles errors per document, so an exception here
+    means the job itself could not run (for example the process pool
+    failed to start). It would otherwise be held unread on the Future and
+    leave the job in 'processing' for good.
     """
-    Starts a file processing job in a background thread.
+    if future.cancelled():
+        error = "cancelled"
+    else:
+        error = future.exception()
+        if error is None:
+            return
+        logger.error("Job %s failed", job_id, exc_info=error)
+    
+    with jobs.shard_for(job_id) as shard:
+        job = shard.get(job_id)
+        if job is not None:
+            job['status'] = 'error'
+            job['log'].append(f"Processing job failed: {error}")
+
+def start_processing_job(filepaths, workdir=None):
+    """
+    Starts a file processing job on the background worker pool.
     
     Args:
         filepaths (list): A list of absolute paths to the files to be processed.
+        workdir (str): Optional directory holding the uploaded files; it is
+                       removed once the job has finished.
         
     Returns:
         str: A unique ID for the created job.
@@ -32,18 +119,19 @@ def start_processing_job(filepaths):
         'total_files': len(filepaths),
         'processed_files': 0,
         'results': [],
-        'log': [f"Job {job_id} created with {len(filepaths)} files."]
+        # Bounded so a huge batch cannot grow the log without limit
+        'log': deque([f"Job {job_id} created with {len(filepaths)} files."], maxlen=MAX_JOB_LOG),
     }
     
-    # The target function for the thread needs to be a callable.
-    # We use a lambda here to pass the required arguments to the processing function.
-    thread = threading.Thread(
-        target=lambda: process_files(job_id, filepaths, jobs)
-    )
-    thread.daemon = True
-    thread.start()
+    # Keep the Future on the job so it can be waited on or cancelled later.
+    future = _EXECUTOR.submit(process_files, job_id, filepaths, jobs)
+    with jobs.shard_for(job_id) as shard:
+        shard[job_id]['future'] = future
+    future.add_done_callback(lambda f: _check_job_failure(job_id, f))
+    if workdir:
+        future.add_done_callback(lambda _: shutil.rmtree(workdir, ignore_errors=True))
     
-    logger.info(f"Background processing thread started for job ID: {job_id}")
+    logger.debug("Background processing job submitted for job ID: %s", job_id)
     return job_id
 
 def get_job_status(job_id):
@@ -53,7 +141,14 @@ def get_job_status(job_id):
     Args:
         job_id (str): The ID of the job to check.
         
+    The job is copied under its shard lock, so callers get a snapshot that
+    the worker cannot change while it is being read.
+    
     Returns:
-        dict or None: The status dictionary for the job, or None if not found.
+        dict or None: A copy of the job's status dictionary, or None if not found.
     """
-    return jobs.get(job_id)
+    with jobs.shard_for(job_id) as shard:
+        job = shard.get(job_id)
+        if job is None:
+            return None
+        return dict(job, log=list(job['log']), results=list(job['results']))
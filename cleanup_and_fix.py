@@ -3,10 +3,18 @@
 # Script to clean up duplicate files and fix import issues in KYO QA Tool
 
 import os
+import re
 import glob
+import json
+import mmap
+import hashlib
 import shutil
+import fnmatch
 import logging
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from diagnose_system import existing_files
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,71 +29,149 @@ def cleanup_duplicate_files():
         '*_v30_2_0.py'
     ]
     
+    # List the directory once and match every pattern against that listing
+    entries = os.listdir('.')
+    
     removed_count = 0
     for pattern in patterns_to_remove:
-        files = glob.glob(pattern)
+        files = [name for name in entries if fnmatch.fnmatchcase(name, pattern)]
         for file_path in files:
             try:
                 os.remove(file_path)
-                logger.info(f"Removed: {file_path}")
+                logger.info("Removed: %s", file_path)
                 removed_count += 1
             except Exception as e:
-                logger.error(f"Failed to remove {file_path}: {e}")
+                logger.error("Failed to remove %s: %s", file_path, e)
     
     logger.info(f"Removed {removed_count} duplicate files")
 
+# Import replacements to fix
+IMPORT_REPLACEMENTS = {
+    'from config_v30_2_0 import': 'from config import',
+    'from config_20250719 import': 'from config import',
+    'import config_v30_2_0': 'import config',
+    'import config_20250719': 'import config',
+    'from custom_patterns_v30_2_0 import': 'from custom_patterns import',
+    'from custom_patterns_20250719 import': 'from custom_patterns import',
+    'import custom_patterns_v30_2_0': 'import custom_patterns',
+    'import custom_patterns_20250719': 'import custom_patterns',
+    'from data_harvesters_v30_2_0 import': 'from data_harvesters import',
+    'from data_harvesters_20250719 import': 'from data_harvesters import',
+    'from processing_engine_v30_2_0 import': 'from processing_engine import',
+    'from processing_engine_20250719 import': 'from processing_engine import',
+    'from backend_v30_2_0 import': 'from backend import',
+    'from backend_20250719 import': 'from backend import',
+    '_v30_2_0': '',
+    '_20250719': ''
+}
+
+# Match every find-string in one pass; longest first so the full import
+# statements win over the bare '_v30_2_0' / '_20250719' suffixes.
+_IMPORT_FIX_RE = re.compile("|".join(
+    re.escape(find_str) for find_str in sorted(IMPORT_REPLACEMENTS, key=len, reverse=True)
+))
+_IMPORT_FIX_BYTES_RE = re.compile(_IMPORT_FIX_RE.pattern.encode('ascii'))
+
+# Files larger than this are memory-mapped instead of read
+MMAP_THRESHOLD = 64 * 1024
+
+# Digests of files that were already clean on a previous run
+CACHE_FILE = '.cleanup_cache.json'
+
+def _write_atomic(path, data):
+    """Write bytes to a temporary file and move it over path in one step."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _load_cache():
+    """Load the path -> sha1 cache from the previous run, if any."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    """Persist the path -> sha1 cache atomically."""
+    try:
+        _write_atomic(CACHE_FILE, json.dumps(cache, indent=2).encode('utf-8'))
+    except OSError as e:
+        logger.warning(f"Failed to save cleanup cache: {e}")
+
+def _fix_one(file_path, known_digest=None):
+    """
+    Fix import statements in a single Python file.
+    
+    Runs in a worker process, so it only reports back and leaves the
+    summary logging to the caller. A file whose digest matches the one
+    recorded as clean on the previous run is not scanned again.
+    
+    Returns:
+        tuple: (fixed, digest) where digest is the sha1 of the clean file,
+               or None if the file could not be processed.
+    """
+    try:
+        if os.stat(file_path).st_size > MMAP_THRESHOLD:
+            # Hash and scan large files through a read-only mapping, and
+            # only copy them into memory when there is something to fix
+            with open(file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest = hashlib.sha1(mm).hexdigest()
+                if digest == known_digest or not _IMPORT_FIX_BYTES_RE.search(mm):
+                    return False, digest
+                raw = mm[:]
+        else:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            
+            digest = hashlib.sha1(raw).hexdigest()
+            if digest == known_digest:
+                return False, digest
+        
+        # Apply all replacements
+        content, replaced = _IMPORT_FIX_RE.subn(
+            lambda m: IMPORT_REPLACEMENTS[m.group()], raw.decode('utf-8')
+        )
+        
+        # Only write if changes were made
+        if replaced:
+            raw = content.encode('utf-8')
+            _write_atomic(file_path, raw)
+            logger.info("Fixed imports in: %s", file_path)
+            return True, hashlib.sha1(raw).hexdigest()
+        return False, digest
+            
+    except Exception as e:
+        logger.error("Failed to fix imports in %s: %s", file_path, e)
+    return False, None
+
 def fix_import_statements():
     """Fix import statements in Python files."""
     logger.info("=== Fixing import statements ===")
     
-    # Get all Python files
-    python_files = glob.glob('*.py')
-    
-    # Import replacements to fix
-    replacements = {
-        'from config_v30_2_0 import': 'from config import',
-        'from config_20250719 import': 'from config import',
-        'import config_v30_2_0': 'import config',
-        'import config_20250719': 'import config',
-        'from custom_patterns_v30_2_0 import': 'from custom_patterns import',
-        'from custom_patterns_20250719 import': 'from custom_patterns import',
-        'import custom_patterns_v30_2_0': 'import custom_patterns',
-        'import custom_patterns_20250719': 'import custom_patterns',
-        'from data_harvesters_v30_2_0 import': 'from data_harvesters import',
-        'from data_harvesters_20250719 import': 'from data_harvesters import',
-        'from processing_engine_v30_2_0 import': 'from processing_engine import',
-        'from processing_engine_20250719 import': 'from processing_engine import',
-        'from backend_v30_2_0 import': 'from backend import',
-        'from backend_20250719 import': 'from backend import',
-        '_v30_2_0': '',
-        '_20250719': ''
-    }
+    # Get all Python files, skipping this cleanup script
+    python_files = [
+        file_path for file_path in glob.glob('*.py')
+        if file_path != os.path.basename(__file__)
+    ]
+    
+    cache = _load_cache()
+    known_digests = [cache.get(file_path) for file_path in python_files]
     
+    # Each file is independent, so fan the work out across processes
     fixed_count = 0
-    for file_path in python_files:
-        if file_path == os.path.basename(__file__):
-            continue  # Don't modify this cleanup script
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            # Apply all replacements
-            for find_str, replace_str in replacements.items():
-                content = content.replace(find_str, replace_str)
-            
-            # Only write if changes were made
-            if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                logger.info(f"Fixed imports in: {file_path}")
-                fixed_count += 1
-                
-        except Exception as e:
-            logger.error(f"Failed to fix imports in {file_path}: {e}")
+    new_cache = {}
+    with ProcessPoolExecutor() as executor:
+        for file_path, (fixed, digest) in zip(
+            python_files, executor.map(_fix_one, python_files, known_digests)
+        ):
+            fixed_count += fixed
+            if digest is not None:
+                new_cache[file_path] = digest
     
+    _save_cache(new_cache)
     logger.info(f"Fixed imports in {fixed_count} files")
 
 def create_missing_init_file():
@@ -122,13 +208,14 @@ def verify_critical_files():
         'START.bat'
     ]
     
+    present = existing_files(critical_files)
     missing_files = []
     for file_path in critical_files:
-        if not os.path.exists(file_path):
+        if file_path not in present:
             missing_files.append(file_path)
-            logger.warning(f"Missing critical file: {file_path}")
+            logger.warning("Missing critical file: %s", file_path)
         else:
-            logger.info(f"✓ Found: {file_path}")
+            logger.debug("✓ Found: %s", file_path)
     
     if missing_files:
         logger.error(f"Missing {len(missing_files)} critical files!")
@@ -153,9 +240,9 @@ def create_directories():
     for directory in directories:
         try:
             os.makedirs(directory, exist_ok=True)
-            logger.info(f"Created directory: {directory}")
+            logger.info("Created directory: %s", directory)
         except Exception as e:
-            logger.error(f"Failed to create directory {directory}: {e}")
+            logger.error("Failed to create directory %s: %s", directory, e)
 
 def main():
     """Main cleanup function."""
@@ -29,10 +29,17 @@ DESCRIPTION_COLUMN_NAME = "Short description"
 QA_NUMBERS_COLUMN_NAME = "QA Numbers"
 
 # Create necessary directories
+_DIRS_READY = False
+
 def ensure_directories():
     """Create all necessary directories if they don't exist."""
-    for directory in [OUTPUT_DIR, LOGS_DIR, PDF_TXT_DIR, CACHE_DIR]:
-        directory.mkdir(parents=True, exist_ok=True)
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    for directory in (OUTPUT_DIR, LOGS_DIR, PDF_TXT_DIR, CACHE_DIR):
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
 
 # Initialize directories on import
 ensure_directories()
\ No newline at end of file
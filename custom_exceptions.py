@@ -3,9 +3,7 @@
 # Date: 2025-07-19
 # Version: 30.1.5
 
-import logging
-
-logger = logging.getLogger(__name__)
+# Exceptions are logged once where they are caught, not when constructed.
 
 class DocumentProcessingError(Exception):
     """
@@ -14,7 +12,6 @@ class DocumentProcessingError(Exception):
     """
     def __init__(self, message="A processing error occurred that requires manual review."):
         self.message = message
-        logger.warning(f"DocumentProcessingError: {self.message}")
         super().__init__(self.message)
 
 class PatternNotFoundError(DocumentProcessingError):
@@ -31,6 +28,5 @@ class OCRProcessingError(Exception):
     """
     def __init__(self, message="A critical error occurred during OCR processing."):
         self.message = message
-        logger.error(f"OCRProcessingError: {self.message}", exc_info=True)
         super().__init__(self.message)
 
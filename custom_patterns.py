@@ -8,12 +8,23 @@
 import re
 import json
 import logging
+import functools
 from pathlib import Path
 
+# Hyperscan is optional; without it patterns are matched with the re module.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
 PATTERNS_FILE = Path(__file__).parent / "user_defined_patterns.json"
 
+# Callbacks run after the patterns are saved, so modules holding
+# compiled patterns can refresh them.
+_save_listeners = []
+
 DEFAULT_PATTERNS = {
     "model_patterns": [
         r"\bFS-\d+[A-Z]*\b",
@@ -37,65 +48,246 @@ def _initialize_patterns_file():
         except Exception as e:
             logger.error(f"Failed to create patterns file: {e}")
 
+@functools.lru_cache(maxsize=256)
+def _compile(pattern, flags=0):
+    """
+    Compile a regex, reusing the result across validation and loading.
+    
+    save_patterns() validates with this and the loaders call it again
+    with the same strings, so each pattern is only compiled once.
+    """
+    return re.compile(pattern, flags)
+
+# Group syntax whose letters must not be lowercased: (?P<name>, (?P=name)
+# and inline flags such as (?i) or (?s:
+_GROUP_PREFIX_RE = re.compile(r"\(\?(?:P<[^>]*>|P=[^)]*\)|[aiLmsux-]+[:)])")
+
+def _lower_literals(pattern):
+    """
+    Lowercase the literal text of a regex, leaving escapes untouched.
+    
+    Escapes such as \\D, \\S, \\W and \\B and group names keep their case
+    because their meaning depends on it; everything else (literals and character class
+    ranges like [A-Z]) is lowercased so the pattern matches lowered text
+    without re.IGNORECASE.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        group = _GROUP_PREFIX_RE.match(pattern, i)
+        if group:
+            # Group names and inline flags are case-sensitive syntax
+            out.append(group.group())
+            i = group.end()
+        elif char == "\\":
+            if pattern.startswith("N{", i + 1):
+                end = pattern.find("}", i)
+                end = len(pattern) if end == -1 else end + 1
+            else:
+                end = i + 2
+            out.append(pattern[i:end])
+            i = end
+        else:
+            out.append(char.lower())
+            i += 1
+    return "".join(out)
+
+def _compile_patterns(patterns, kind):
+    """
+    Compile and validate each pattern on its own.
+    
+    Patterns are kept separate, not joined into one alternation, so every
+    pattern reports its own hits even where they overlap another
+    pattern's, and inline flags such as (?i) stay valid.
+    
+    Each regex is compiled case-sensitively with lowercased literals and is
+    meant to be run over lowercased text, which is faster in re than
+    matching with re.IGNORECASE. Invalid patterns are logged and skipped.
+    
+    Args:
+        patterns (list): Raw regex pattern strings
+        kind (str): Pattern category used in log messages ("model" or "QA")
+        
+    Returns:
+        tuple: The compiled re.Pattern objects, in file order
+    """
+    compiled = []
+    for pattern in patterns:
+        try:
+            _compile(pattern)
+        except re.error as e:
+            logger.warning(f"Invalid {kind} pattern '{pattern}': {e}")
+            continue
+        try:
+            compiled.append(_compile(_lower_literals(pattern)))
+        except re.error:
+            # Lowering broke something (e.g. a case-sensitive inline flag);
+            # keep the original pattern, which also matches lowered text
+            compiled.append(_compile(pattern, re.IGNORECASE))
+    return tuple(compiled)
+
+def _read_pattern_file():
+    """
+    Read the raw model and QA pattern lists from the patterns file.
+    
+    Returns:
+        tuple: (model_patterns, qa_patterns)
+    """
+    with open(PATTERNS_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return (
+        data.get("model_patterns", DEFAULT_PATTERNS["model_patterns"]),
+        data.get("qa_patterns", DEFAULT_PATTERNS["qa_patterns"]),
+    )
+
+@functools.lru_cache(maxsize=4)
+def _load_compiled(mtime_ns, size):
+    """
+    Read the patterns file and compile each pattern.
+    
+    The arguments are only the cache key: results are reused until the
+    patterns file's modification time or size changes.
+    
+    Returns:
+        tuple: (model_regexes, qa_regexes)
+    """
+    model_patterns, qa_patterns = _read_pattern_file()
+    
+    model_res = _compile_patterns(model_patterns, "model")
+    qa_res = _compile_patterns(qa_patterns, "QA")
+    
+    logger.debug(f"Loaded {len(model_res)} model patterns and {len(qa_res)} QA patterns")
+    return model_res, qa_res
+
 def get_patterns():
     """
     Get compiled regex patterns for model and QA number detection.
     
+    Compiled patterns are cached and only rebuilt when the patterns file
+    changes on disk.
+    
     Returns:
-        tuple: (compiled_model_patterns, compiled_qa_patterns)
+        tuple: (model_regexes, qa_regexes), each a tuple of re.Pattern
     """
     _initialize_patterns_file()
     
     try:
-        with open(PATTERNS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        model_patterns = data.get("model_patterns", DEFAULT_PATTERNS["model_patterns"])
-        qa_patterns = data.get("qa_patterns", DEFAULT_PATTERNS["qa_patterns"])
-        
-        # Compile regex patterns
-        compiled_model = []
-        compiled_qa = []
-        
-        for pattern in model_patterns:
-            try:
-                compiled_model.append(re.compile(pattern, re.IGNORECASE))
-            except re.error as e:
-                logger.warning(f"Invalid model pattern '{pattern}': {e}")
-                
-        for pattern in qa_patterns:
-            try:
-                compiled_qa.append(re.compile(pattern, re.IGNORECASE))
-            except re.error as e:
-                logger.warning(f"Invalid QA pattern '{pattern}': {e}")
-        
-        logger.debug(f"Loaded {len(compiled_model)} model patterns and {len(compiled_qa)} QA patterns")
-        return compiled_model, compiled_qa
+        st = PATTERNS_FILE.stat()
+        return _load_compiled(st.st_mtime_ns, st.st_size)
         
     except Exception as e:
         logger.error(f"Failed to load patterns: {e}")
         # Return compiled default patterns as fallback
-        compiled_model = [re.compile(p, re.IGNORECASE) for p in DEFAULT_PATTERNS["model_patterns"]]
-        compiled_qa = [re.compile(p, re.IGNORECASE) for p in DEFAULT_PATTERNS["qa_patterns"]]
-        return compiled_model, compiled_qa
+        model_res = _compile_patterns(DEFAULT_PATTERNS["model_patterns"], "model")
+        qa_res = _compile_patterns(DEFAULT_PATTERNS["qa_patterns"], "QA")
+        return model_res, qa_res
+
+def _build_hyperscan_database(model_patterns, qa_patterns):
+    """
+    Compile model and QA patterns into one Hyperscan block-mode prefilter.
+    
+    Hyperscan's match semantics differ from re (it reports every end
+    offset rather than re's leftmost, greedy or lazy choice), so the
+    database only says which patterns occur in a text. Those patterns are
+    then run with re, which produces the actual hits. Each expression is
+    compiled in UTF-8/Unicode-property mode, so \\b, \\w and \\d agree with
+    re on non-ASCII text, and as a prefilter, so constructs Hyperscan
+    cannot match exactly (such as backreferences) are approximated by a
+    superset instead of failing the whole database.
+    
+    Returns:
+        tuple or None: (database, model_regexes, qa_regexes), where pattern
+                       ID n is model_regexes[n] for n < len(model_regexes)
+                       and qa_regexes[n - len(model_regexes)] otherwise, or
+                       None if Hyperscan cannot compile the patterns
+    """
+    model_res = _compile_patterns(model_patterns, "model")
+    qa_res = _compile_patterns(qa_patterns, "QA")
+    if not model_res and not qa_res:
+        return None
+    
+    expressions = [p.pattern.encode('utf-8') for p in model_res + qa_res]
+    flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+             | hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+             | hyperscan.HS_FLAG_ALLOWEMPTY)
+    try:
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags] * len(expressions),
+        )
+    except Exception as e:
+        logger.warning(f"Hyperscan could not compile the patterns, using re instead: {e}")
+        return None
+    
+    logger.debug(f"Compiled {len(expressions)} patterns into a Hyperscan database")
+    return database, model_res, qa_res
+
+@functools.lru_cache(maxsize=4)
+def _load_hyperscan(mtime_ns, size):
+    """Build the Hyperscan database, cached on the patterns file mtime and size."""
+    return _build_hyperscan_database(*_read_pattern_file())
+
+def get_hyperscan_database():
+    """
+    Get a Hyperscan database of all model and QA patterns, if available.
+    
+    Returns:
+        tuple or None: (database, model_regexes, qa_regexes), or None when
+                       hyperscan is not installed or cannot compile the
+                       current patterns
+    """
+    if hyperscan is None:
+        return None
+    
+    _initialize_patterns_file()
+    
+    try:
+        st = PATTERNS_FILE.stat()
+        return _load_hyperscan(st.st_mtime_ns, st.st_size)
+    except Exception as e:
+        logger.error(f"Failed to build Hyperscan database: {e}")
+        return None
+
+@functools.lru_cache(maxsize=4)
+def _load_strings(mtime_ns, size):
+    """Read the raw pattern strings, cached on the patterns file mtime and size."""
+    with open(PATTERNS_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return tuple(data.get("model_patterns", [])), tuple(data.get("qa_patterns", []))
 
 def get_pattern_strings():
     """
     Get the raw pattern strings (for editing in UI).
     
+    The file is only re-read when it changes on disk.
+    
     Returns:
         tuple: (model_pattern_strings, qa_pattern_strings)
     """
     _initialize_patterns_file()
     
     try:
-        with open(PATTERNS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data.get("model_patterns", []), data.get("qa_patterns", [])
+        st = PATTERNS_FILE.stat()
+        model_patterns, qa_patterns = _load_strings(st.st_mtime_ns, st.st_size)
+        # Copies, so callers cannot change the cached lists
+        return list(model_patterns), list(qa_patterns)
     except Exception as e:
         logger.error(f"Failed to load pattern strings: {e}")
         return DEFAULT_PATTERNS["model_patterns"], DEFAULT_PATTERNS["qa_patterns"]
 
+def add_save_listener(callback):
+    """
+    Register a callback to be run after patterns are saved.
+    
+    Args:
+        callback (callable): Function taking no arguments
+    """
+    _save_listeners.append(callback)
+
 def save_patterns(model_patterns, qa_patterns):
     """
     Save patterns to the patterns file.
@@ -112,13 +304,13 @@ def save_patterns(model_patterns, qa_patterns):
     # Validate patterns by trying to compile them
     for pattern in model_patterns:
         try:
-            re.compile(pattern)
+            _compile(pattern)
         except re.error as e:
             raise ValueError(f"Invalid model pattern '{pattern}': {e}")
             
     for pattern in qa_patterns:
         try:
-            re.compile(pattern)
+            _compile(pattern)
         except re.error as e:
             raise ValueError(f"Invalid QA pattern '{pattern}': {e}")
     
@@ -128,10 +320,20 @@ def save_patterns(model_patterns, qa_patterns):
                 "model_patterns": model_patterns, 
                 "qa_patterns": qa_patterns
             }, f, indent=4)
+        # Drop cached regexes even if the rewrite kept the same mtime and size
+        _load_compiled.cache_clear()
+        _load_hyperscan.cache_clear()
+        _load_strings.cache_clear()
         logger.info("Patterns saved successfully")
     except Exception as e:
         logger.error(f"Failed to save patterns: {e}")
         raise
+    
+    for callback in _save_listeners:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Pattern save listener failed: {e}")
 
 # Initialize patterns file on module import
 _initialize_patterns_file()
\ No newline at end of file
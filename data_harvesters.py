@@ -5,11 +5,104 @@
 
 import re
 import logging
-from custom_patterns import get_patterns
+import threading
+from custom_patterns import get_patterns, get_hyperscan_database, add_save_listener
 from config import UNWANTED_AUTHORS, STANDARDIZATION_RULES
 
 logger = logging.getLogger(__name__)
 
+# Compiled patterns are bound once at import and refreshed by
+# reload_patterns() whenever the user saves new patterns.
+_MODEL_RES, _QA_RES = get_patterns()
+_HS = get_hyperscan_database()
+_AUTHOR_RE = re.compile(r"^Author:\s*(.*)", re.MULTILINE | re.IGNORECASE)
+
+# All standardization rules as one regex, so each model is rewritten in a
+# single pass. Longer rules come first so they win over their prefixes.
+_STD_RE = re.compile("|".join(
+    re.escape(rule) for rule in sorted(STANDARDIZATION_RULES, key=len, reverse=True)
+)) if STANDARDIZATION_RULES else None
+
+def _standardize_model(model):
+    """Apply STANDARDIZATION_RULES to a model name."""
+    if _STD_RE is None:
+        return model
+    return _STD_RE.sub(lambda m: STANDARDIZATION_RULES[m.group()], model)
+
+def reload_patterns():
+    """Recompile the model and QA patterns from the patterns file."""
+    global _MODEL_RES, _QA_RES, _HS
+    _MODEL_RES, _QA_RES = get_patterns()
+    _HS = get_hyperscan_database()
+    logger.info("Reloaded model and QA patterns.")
+
+add_save_listener(reload_patterns)
+
+def _scan_re(regexes, search_content, search_lower):
+    """
+    Collect the matches of each regex, deduplicated in a dict.
+    
+    Every pattern is run on its own, so overlapping hits from different
+    patterns are all reported. Like findall(), a pattern with capture
+    groups contributes its first group instead of the full match.
+    
+    The regexes are run over the lowered text and the hits are sliced from
+    the original, so they keep the document's case. If lowering changed
+    the text length (a few non-ASCII characters do), offsets would not
+    line up, so the original text is matched case-insensitively instead.
+    """
+    lowered = len(search_lower) == len(search_content)
+    target = search_lower if lowered else search_content
+    
+    matches = {}
+    for regex in regexes:
+        if not lowered:
+            regex = re.compile(regex.pattern, regex.flags | re.IGNORECASE)
+        group = 1 if regex.groups else 0
+        for match in regex.finditer(target):
+            start, end = match.span(group)
+            matches[search_content[start:end] if start != -1 else ""] = None
+    return matches
+
+# Result for input with nothing to search; copied per call
+_EMPTY_RESULT = {"models": "Not Found", "author": "", "qa_numbers": ""}
+
+# A Hyperscan database shares one scratch space, so scans are serialized
+_HS_LOCK = threading.Lock()
+
+def _scan_hyperscan(search_content, search_lower):
+    """
+    Find model and QA hits, using Hyperscan to pick the patterns to run.
+    
+    One Hyperscan pass reports which patterns occur anywhere in the text;
+    only those are then run with re, so the hits are exactly what the re
+    path would return. Text that is not valid UTF-8 (lone surrogates)
+    cannot be scanned and goes straight to re.
+    
+    Returns:
+        tuple: (model_matches, qa_matches) as dicts keyed by matched text
+    """
+    database, model_res, qa_res = _HS
+    try:
+        data = search_content.encode('utf-8')
+    except UnicodeEncodeError:
+        return (_scan_re(model_res, search_content, search_lower),
+                _scan_re(qa_res, search_content, search_lower))
+    
+    hits = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(pattern_id)
+    
+    with _HS_LOCK:
+        database.scan(data, match_event_handler=on_match)
+    
+    model_count = len(model_res)
+    model_hits = [model_res[i] for i in sorted(hits) if i < model_count]
+    qa_hits = [qa_res[i - model_count] for i in sorted(hits) if i >= model_count]
+    return (_scan_re(model_hits, search_content, search_lower),
+            _scan_re(qa_hits, search_content, search_lower))
+
 def find_patterns(text, filename=""):
     """
     Searches through the given text to find all predefined regex patterns.
@@ -21,63 +114,45 @@ def find_patterns(text, filename=""):
     Returns:
         dict: A dictionary with extracted data including models, author, and qa_numbers.
     """
-    logger.info("Searching for patterns in the document text.")
+    # Nothing to search when OCR produced no text and there is no
+    # filename to fall back on
+    if not filename and (not text or text.isspace()):
+        return _EMPTY_RESULT.copy()
     
-    # Get the compiled regex patterns
-    model_patterns, qa_patterns = get_patterns()
+    logger.debug("Searching for patterns in the document text.")
     
     # Create search content including filename for better matching
     search_content = f"{text}\n{filename.replace('_', ' ')}"
     
-    # Find model matches
-    model_matches = set()
-    for pattern in model_patterns:
-        try:
-            matches = pattern.findall(search_content)
-            for match in matches:
-                # Handle both single matches and group matches
-                if isinstance(match, tuple):
-                    model_matches.add(match[0].strip())
-                else:
-                    model_matches.add(match.strip())
-        except Exception as e:
-            logger.warning(f"Error applying model pattern {pattern.pattern}: {e}")
-            continue
+    # Find model and QA matches. A dict dedupes the raw hits; stripping
+    # happens once per unique hit below.
+    # Lowered once here; the compiled patterns are case-sensitive
+    search_lower = search_content.lower()
+    if _HS is not None:
+        model_matches, qa_matches = _scan_hyperscan(search_content, search_lower)
+    else:
+        model_matches = _scan_re(_MODEL_RES, search_content, search_lower)
+        qa_matches = _scan_re(_QA_RES, search_content, search_lower)
     
     # Apply standardization rules to models
-    standardized_models = []
-    for model in model_matches:
-        standardized_model = model
-        for rule, replacement in STANDARDIZATION_RULES.items():
-            standardized_model = standardized_model.replace(rule, replacement)
-        standardized_models.append(standardized_model)
-    
-    # Find QA number matches
-    qa_matches = set()
-    for pattern in qa_patterns:
-        try:
-            matches = pattern.findall(search_content)
-            for match in matches:
-                # Handle both single matches and group matches
-                if isinstance(match, tuple):
-                    qa_matches.add(match[0].strip())
-                else:
-                    qa_matches.add(match.strip())
-        except Exception as e:
-            logger.warning(f"Error applying QA pattern {pattern.pattern}: {e}")
-            continue
+    standardized_models = sorted({
+        _standardize_model(stripped)
+        for stripped in map(str.strip, model_matches) if stripped
+    })
+    
+    qa_numbers = sorted({stripped for stripped in map(str.strip, qa_matches) if stripped})
     
     # Find author
     author = ""
-    author_match = re.search(r"^Author:\s*(.*)", text, re.MULTILINE | re.IGNORECASE)
+    author_match = _AUTHOR_RE.search(text)
     if author_match:
         found_author = author_match.group(1).strip()
         if found_author and found_author not in UNWANTED_AUTHORS:
             author = found_author
     
     # Format results
-    models_str = ", ".join(sorted(standardized_models)) if standardized_models else "Not Found"
-    qa_numbers_str = ", ".join(sorted(qa_matches)) if qa_matches else ""
+    models_str = ", ".join(standardized_models) if standardized_models else "Not Found"
+    qa_numbers_str = ", ".join(qa_numbers)
     
     result = {
         "models": models_str,
@@ -85,7 +160,7 @@ def find_patterns(text, filename=""):
         "qa_numbers": qa_numbers_str
     }
     
-    logger.info(f"Pattern search results: Models='{models_str}', Author='{author}', QA='{qa_numbers_str}'")
+    logger.debug("Pattern search results: Models='%s', Author='%s', QA='%s'", models_str, author, qa_numbers_str)
     return result
 
 def harvest_all_data(text, filename):
@@ -7,8 +7,25 @@ import sys
 import os
 import platform
 import subprocess
-import importlib
+import importlib.util
+from importlib import metadata
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+def existing_files(paths):
+    """Return the subset of paths that exist, listing each directory only once."""
+    listings = {}
+    present = set()
+    for path in paths:
+        directory, _, name = path.rpartition('/')
+        if directory not in listings:
+            try:
+                listings[directory] = set(os.listdir(directory or '.'))
+            except OSError:
+                listings[directory] = set()
+        if name in listings[directory]:
+            present.add(path)
+    return present
 
 def print_header(title):
     """Print a formatted section header."""
@@ -53,29 +70,35 @@ def check_dependencies():
     """Check if required dependencies are installed."""
     print_header("DEPENDENCY CHECK")
     
-    required_packages = [
-        'flask', 'werkzeug', 'openpyxl', 'PIL', 'webview', 
-        'fitz', 'pandas', 'pytesseract', 'requests'
-    ]
+    # Import name -> distribution name, so versions can be read from the
+    # installed package metadata without importing heavy modules
+    required_packages = {
+        'flask': 'Flask',
+        'werkzeug': 'Werkzeug',
+        'openpyxl': 'openpyxl',
+        'PIL': 'Pillow',
+        'webview': 'pywebview',
+        'fitz': 'PyMuPDF',
+        'pytesseract': 'pytesseract',
+        'requests': 'requests'
+    }
     
-    for package in required_packages:
+    for package, dist_name in required_packages.items():
+        try:
+            print(f"✅ {package} - Version: {metadata.version(dist_name)}")
+            continue
+        except metadata.PackageNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  {package} - ERROR: {e}")
+            continue
+        
+        # No metadata found; the module may still be importable
         try:
-            if package == 'PIL':
-                importlib.import_module('PIL')
-            elif package == 'fitz':
-                importlib.import_module('fitz')
-            elif package == 'webview':
-                import webview
-                print(f"✅ {package} - Version: {webview.__version__ if hasattr(webview, '__version__') else 'Unknown'}")
-                continue
+            if importlib.util.find_spec(package) is not None:
+                print(f"✅ {package} - Version: Unknown")
             else:
-                module = importlib.import_module(package)
-                
-            version = getattr(module, '__version__', 'Unknown')
-            print(f"✅ {package} - Version: {version}")
-            
-        except ImportError as e:
-            print(f"❌ {package} - NOT INSTALLED ({e})")
+                print(f"❌ {package} - NOT INSTALLED")
         except Exception as e:
             print(f"⚠️  {package} - ERROR: {e}")
 
@@ -178,9 +201,10 @@ def check_critical_files():
         'web/index.html', 'web/app.js', 'requirements.txt', 'START.bat'
     ]
     
+    present = existing_files(critical_files)
     missing_files = []
     for file_path in critical_files:
-        if Path(file_path).exists():
+        if file_path in present:
             print(f"✅ {file_path}")
         else:
             print(f"❌ {file_path} - MISSING")
@@ -191,20 +215,37 @@ def check_critical_files():
     else:
         print("\n✅ All critical files present")
 
+def _probe_port(port):
+    """Return the connect_ex() result for a local port (0 means in use)."""
+    import socket
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(1)
+    try:
+        return sock.connect_ex(('127.0.0.1', port))
+    finally:
+        sock.close()
+
+def _probe_localhost():
+    """Return True if something answers HTTP on localhost."""
+    try:
+        import requests
+        requests.get("http://127.0.0.1", timeout=2)
+        return True
+    except Exception:
+        return False
+
 def check_network_and_ports():
     """Check network connectivity and port availability."""
     print_header("NETWORK & PORTS CHECK")
     
+    # Run both probes at once so the check takes as long as the slower one
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        port_future = executor.submit(_probe_port, 5000)
+        localhost_future = executor.submit(_probe_localhost)
+    
     try:
-        import socket
-        
-        # Check if port 5000 is available
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex(('127.0.0.1', 5000))
-        sock.close()
-        
-        if result == 0:
+        if port_future.result() == 0:
             print("⚠️  Port 5000 is already in use")
             print("   Another Flask application might be running")
         else:
@@ -214,11 +255,9 @@ def check_network_and_ports():
         print(f"❌ Network check failed: {e}")
     
     # Test localhost connectivity
-    try:
-        import requests
-        response = requests.get("http://127.0.0.1", timeout=2)
+    if localhost_future.result():
         print("✅ Localhost connectivity OK")
-    except:
+    else:
         print("✅ Localhost not responding (this is normal)")
 
 def run_webview_test():
@@ -6,10 +6,67 @@
 import os
 import sys
 import time
+import shutil
+import socket
+import platform
+import functools
 import threading
 import subprocess
+import http.client
+import importlib.util
 from pathlib import Path
 
+from setup_stamp import stamp_is_current, write_stamp
+
+# On POSIX, subprocess starts children with posix_spawn (vfork-style, so the
+# launcher's address space is not copied) only when close_fds is False and
+# no cwd, preexec_fn or new session is requested. File descriptors are
+# non-inheritable by default, so nothing leaks into the children.
+_SPAWN_KWARGS = {} if os.name == 'nt' else {"close_fds": False}
+
+def _run(argv, **kwargs):
+    """subprocess.run() that stays on the posix_spawn fast path."""
+    return subprocess.run(argv, **_SPAWN_KWARGS, **kwargs)
+
+def _spawn(argv, **kwargs):
+    """subprocess.Popen() that stays on the posix_spawn fast path."""
+    return subprocess.Popen(argv, **_SPAWN_KWARGS, **kwargs)
+
+# Pause between setup steps so interactive users can follow the progress;
+# skipped when output is not a terminal or KYO_NO_PACE is set
+_PACE = 1.0 if sys.stdout.isatty() and not os.environ.get("KYO_NO_PACE") else 0.0
+
+# Wheels are cached here so a rebuilt venv installs without re-downloading
+PIP_CACHE_DIR = ".pip-cache"
+
+# Exact versions from the last successful install. While it is newer than
+# requirements.txt, installs skip dependency resolution entirely.
+LOCK_FILE = "requirements.lock"
+
+def _lock_is_current():
+    """Return True if LOCK_FILE exists and is newer than requirements.txt."""
+    try:
+        return os.path.getmtime(LOCK_FILE) >= os.path.getmtime("requirements.txt")
+    except OSError:
+        return False
+
+def _port_open(host, port, timeout=0.1):
+    """Return True if a TCP connection to host:port is accepted."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        return sock.connect_ex((host, port)) == 0
+
+def _http_ok(host, port, timeout=2):
+    """Return True if GET / on host:port answers with HTTP 200."""
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("GET", "/")
+        return connection.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
 def print_banner():
     """Print a nice console banner."""
     print("\n" + "="*70)
@@ -17,19 +74,37 @@ def print_banner():
     print("   Author: Kenneth Walker | Version: 30.2.0")
     print("="*70)
 
+@functools.lru_cache(maxsize=1)
 def check_gui_availability():
-    """Check if GUI (tkinter) is available."""
-    try:
-        import tkinter as tk
-        # Try to create a simple test window
-        root = tk.Tk()
-        root.withdraw()  # Hide it immediately
-        root.destroy()
+    """
+    Check if GUI (tkinter) is available.
+    
+    Only checks that tkinter is installed and a display is likely present;
+    no Tk window is created here. If Tk still cannot start, GUILauncher
+    fails in __init__ and main() falls back to the console launcher.
+    """
+    if importlib.util.find_spec("tkinter") is None:
+        reason = "tkinter is not installed"
+    elif os.name == 'nt' or sys.platform == 'darwin' or os.environ.get("DISPLAY"):
         return True
-    except Exception as e:
-        print(f"⚠️  GUI not available: {e}")
-        print("   Falling back to console mode...")
-        return False
+    else:
+        reason = "no display available"
+    
+    print(f"⚠️  GUI not available: {reason}")
+    print("   Falling back to console mode...")
+    return False
+
+# Console prefix for each log level
+_PREFIX = {
+    "INFO": "ℹ️ ",
+    "SUCCESS": "✅",
+    "WARNING": "⚠️ ",
+    "ERROR": "❌"
+}
+
+# Every possible console progress bar, indexed by the number of filled cells
+_BAR_LENGTH = 30
+_BARS = [('█' * filled).ljust(_BAR_LENGTH, '-') for filled in range(_BAR_LENGTH + 1)]
 
 class ConsoleLauncher:
     """Console-based launcher as fallback when GUI isn't available."""
@@ -39,24 +114,36 @@ class ConsoleLauncher:
         self.server_process = None
         self.server_ready = False
         
+        # Executables inside the virtual environment
+        if os.name == 'nt':  # Windows
+            self.venv_bin = Path("venv") / "Scripts"
+            self.venv_python = self.venv_bin / "python.exe"
+            self.venv_pip = self.venv_bin / "pip.exe"
+        else:  # Unix-like
+            self.venv_bin = Path("venv") / "bin"
+            self.venv_python = self.venv_bin / "python"
+            self.venv_pip = self.venv_bin / "pip"
+        
+    def venv_is_usable(self):
+        """Return True if the venv's python exists, logging an error if not."""
+        if self.venv_python.exists():
+            return True
+        self.log_message(f"Virtual environment is incomplete: {self.venv_python} not found", "ERROR")
+        self.log_message("Delete the 'venv' folder and run the launcher again", "ERROR")
+        return False
+        
     def log_message(self, message, level="INFO"):
         """Print a formatted log message."""
         timestamp = time.strftime("%H:%M:%S")
-        prefix = {
-            "INFO": "ℹ️ ",
-            "SUCCESS": "✅",
-            "WARNING": "⚠️ ",
-            "ERROR": "❌"
-        }.get(level, "")
+        prefix = _PREFIX.get(level, "")
         
         print(f"[{timestamp}] {prefix} {message}")
         
     def update_progress(self, step, total_steps, message):
         """Show progress in console."""
         percentage = int((step / total_steps) * 100)
-        bar_length = 30
-        filled_length = int(bar_length * step // total_steps)
-        bar = '█' * filled_length + '-' * (bar_length - filled_length)
+        filled_length = _BAR_LENGTH * step // total_steps
+        bar = _BARS[filled_length]
         
         print(f"\n📊 Progress: [{bar}] {percentage}% - Step {step}/{total_steps}")
         self.log_message(message)
@@ -65,14 +152,12 @@ class ConsoleLauncher:
         """Check Python version."""
         self.update_progress(1, 5, "Checking Python version...")
         
-        version = sys.version_info
-        if version.major < 3 or (version.major == 3 and version.minor < 9):
-            self.log_message(f"Python {version.major}.{version.minor} detected", "WARNING")
+        if sys.version_info < (3, 9):
+            self.log_message(f"Python {platform.python_version()} detected", "WARNING")
             self.log_message("Python 3.9+ recommended for best compatibility", "WARNING")
         else:
-            self.log_message(f"Python {version.major}.{version.minor}.{version.micro} - OK", "SUCCESS")
+            self.log_message(f"Python {platform.python_version()} - OK", "SUCCESS")
         
-        time.sleep(1)
         return True
         
     def setup_virtual_environment(self):
@@ -81,7 +166,7 @@ class ConsoleLauncher:
             self.update_progress(2, 5, "Creating virtual environment...")
             
             try:
-                result = subprocess.run(
+                result = _run(
                     [sys.executable, "-m", "venv", "venv"],
                     capture_output=True,
                     text=True,
@@ -95,31 +180,47 @@ class ConsoleLauncher:
             self.update_progress(2, 5, "Virtual environment exists - OK")
             self.log_message("Using existing virtual environment", "SUCCESS")
             
-        time.sleep(1)
+        time.sleep(_PACE)
         return True
         
     def install_dependencies(self):
-        """Install Python dependencies."""
-        if self.is_first_run:
+        """Install Python dependencies unless the shared stamp shows they are current."""
+        if not stamp_is_current():
             self.update_progress(3, 5, "Installing dependencies...")
             
-            # Determine pip executable path
-            if os.name == 'nt':  # Windows
-                pip_path = os.path.join("venv", "Scripts", "pip.exe")
-            else:  # Unix-like
-                pip_path = os.path.join("venv", "bin", "pip")
+            if not self.venv_is_usable():
+                return False
+            
+            use_lock = _lock_is_current()
+            if use_lock:
+                requirements = ["-r", LOCK_FILE, "--no-deps"]
+            else:
+                requirements = ["-r", "requirements.txt"]
+            
+            # uv resolves and installs much faster than pip when it is available
+            uv_path = shutil.which("uv")
+            if uv_path:
+                command = [uv_path, "pip", "install", "--python", self.venv_python] + requirements
+            else:
+                command = [self.venv_pip, "install", "--prefer-binary",
+                           "--cache-dir", PIP_CACHE_DIR] + requirements
+            env = dict(os.environ, PIP_DISABLE_PIP_VERSION_CHECK="1")
                 
             try:
                 print("   📦 Installing packages (this may take a moment)...")
-                result = subprocess.run(
-                    [pip_path, "install", "-r", "requirements.txt"],
+                result = _run(
+                    command,
                     capture_output=True,
                     text=True,
+                    env=env,
                     timeout=300  # 5 minute timeout
                 )
                 
                 if result.returncode == 0:
                     self.log_message("All dependencies installed successfully", "SUCCESS")
+                    write_stamp()
+                    if not use_lock:
+                        self.write_lock_file(uv_path, env)
                 else:
                     self.log_message("Some dependencies had issues, but continuing...", "WARNING")
                     if result.stderr:
@@ -133,61 +234,61 @@ class ConsoleLauncher:
         else:
             self.update_progress(3, 5, "Dependencies already installed - OK")
             self.log_message("Dependencies check passed", "SUCCESS")
+            # Rewrite the (unchanged) hash so the stamp is newer than this
+            # launcher again and the next start can skip setup
+            write_stamp()
             
         return True
         
+    def write_lock_file(self, uv_path, env):
+        """Pin the freshly resolved versions so later installs can skip resolution."""
+        if uv_path:
+            command = [uv_path, "pip", "freeze", "--python", self.venv_python]
+        else:
+            command = [self.venv_python, "-m", "pip", "freeze"]
+        try:
+            result = _run(command, capture_output=True, text=True, env=env, timeout=60)
+            if result.returncode == 0 and result.stdout.strip():
+                with open(LOCK_FILE, "w", encoding="utf-8") as f:
+                    f.write(result.stdout)
+        except (OSError, subprocess.SubprocessError):
+            # The lock file is only an optimization
+            pass
+        
     def check_tesseract(self):
         """Check Tesseract OCR installation."""
         self.update_progress(4, 5, "Checking Tesseract OCR...")
         
-        tesseract_paths = [
-            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe"
+        tesseract_dirs = [
+            r"C:\Program Files\Tesseract-OCR",
+            r"C:\Program Files (x86)\Tesseract-OCR"
         ]
         
-        tesseract_found = False
-        for path in tesseract_paths:
-            if os.path.exists(path):
-                self.log_message(f"Tesseract found at: {path}", "SUCCESS")
-                tesseract_found = True
-                break
-                
-        if not tesseract_found:
-            # Try system PATH
-            try:
-                result = subprocess.run(
-                    ["tesseract", "--version"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    timeout=5
-                )
-                self.log_message("Tesseract found in system PATH", "SUCCESS")
-                tesseract_found = True
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                pass
+        # One PATH-style lookup over the default install folders and the
+        # system PATH; no tesseract process is started
+        search_path = os.pathsep.join(tesseract_dirs + [os.environ.get("PATH", "")])
+        tesseract_path = shutil.which("tesseract", path=search_path)
+        tesseract_found = tesseract_path is not None
+        if tesseract_found:
+            self.log_message(f"Tesseract found at: {tesseract_path}", "SUCCESS")
                 
         if not tesseract_found:
             self.log_message("Tesseract OCR not found", "WARNING")
             self.log_message("Download from: https://github.com/UB-Mannheim/tesseract/wiki", "WARNING")
             self.log_message("OCR functionality will be limited without Tesseract", "WARNING")
         
-        time.sleep(1)
         return True
         
     def start_server(self):
         """Start the Flask server."""
         self.update_progress(5, 5, "Starting application server...")
         
+        if not self.venv_is_usable():
+            return False
+            
         try:
-            # Determine python executable path
-            if os.name == 'nt':  # Windows
-                python_path = os.path.join("venv", "Scripts", "python.exe")
-            else:  # Unix-like
-                python_path = os.path.join("venv", "bin", "python")
-                
-            self.server_process = subprocess.Popen(
-                [python_path, "server.py"],
+            self.server_process = _spawn(
+                [self.venv_python, "server.py"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
@@ -198,19 +299,29 @@ class ConsoleLauncher:
             
             # Wait for server to be ready
             print("   🔄 Waiting for server to start...")
-            for attempt in range(30):  # Wait up to 30 seconds
-                try:
-                    import requests
-                    response = requests.get("http://127.0.0.1:5000", timeout=2)
-                    if response.status_code == 200:
-                        self.server_ready = True
-                        self.log_message("Server is ready!", "SUCCESS")
-                        break
-                except Exception:
-                    pass
-                    
-                print(f"   ⏳ Still waiting... ({attempt + 1}/30)")
-                time.sleep(1)
+            # Poll the port with a cheap TCP connect, backing off from 25 ms,
+            # and only issue an HTTP request once the port accepts connections
+            start = time.monotonic()
+            deadline = start + 30  # Wait up to 30 seconds
+            delay = 0.025
+            reported = 0
+            while time.monotonic() < deadline:
+                if _port_open("127.0.0.1", 5000) and _http_ok("127.0.0.1", 5000):
+                    self.server_ready = True
+                    self.log_message("Server is ready!", "SUCCESS")
+                    break
+                
+                # Update a single line in place, once per elapsed second
+                elapsed = int(time.monotonic() - start)
+                if elapsed > reported:
+                    reported = elapsed
+                    sys.stdout.write(f"\r   ⏳ Waiting for server... {elapsed}/30")
+                    sys.stdout.flush()
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+            
+            if reported:
+                sys.stdout.write("\n")
                 
             if not self.server_ready:
                 self.log_message("Server failed to start properly", "ERROR")
@@ -273,24 +384,34 @@ class ConsoleLauncher:
             except:
                 self.server_process.kill()
                 
-    def run(self):
-        """Run the complete setup and launch process."""
+    def run(self, skip_setup=False):
+        """
+        Run the complete setup and launch process.
+        
+        Args:
+            skip_setup (bool): Go straight to starting the server. Setup is
+                               also skipped when a previous setup is still fresh.
+        """
         print_banner()
         
         try:
-            print("\n🔧 Starting setup process...")
-            
-            if not self.check_python_version():
-                return False
-                
-            if not self.setup_virtual_environment():
-                return False
+            if skip_setup or (not self.is_first_run and stamp_is_current(newer_than=[__file__])):
+                self.log_message("Setup is up to date - skipping checks", "SUCCESS")
                 
-            if not self.install_dependencies():
-                return False
+            else:
+                print("\n🔧 Starting setup process...")
                 
-            if not self.check_tesseract():
-                return False
+                if not self.check_python_version():
+                    return False
+                    
+                if not self.setup_virtual_environment():
+                    return False
+                    
+                if not self.install_dependencies():
+                    return False
+                    
+                if not self.check_tesseract():
+                    return False
                 
             if not self.start_server():
                 return False
@@ -322,7 +443,14 @@ class ConsoleLauncher:
 class GUILauncher:
     """GUI-based launcher using tkinter."""
     
-    def __init__(self):
+    # Older lines are dropped from the log area beyond this many
+    MAX_LOG_LINES = 500
+    
+    # Minimum seconds between forced redraws from log_message()
+    UPDATE_INTERVAL = 0.05
+    
+    def __init__(self, skip_setup=False):
+        self.skip_setup = skip_setup
         try:
             import tkinter as tk
             from tkinter import ttk, messagebox
@@ -365,6 +493,7 @@ class GUILauncher:
         self.is_first_run = not Path("venv").exists()
         self.server_process = None
         self.server_ready = False
+        self.last_update_ts = 0.0
         
     def setup_widgets(self):
         """Create and layout all widgets."""
@@ -470,13 +599,21 @@ class GUILauncher:
         self.close_button.pack(side="right")
         
     def log_message(self, message):
-        """Add a message to the log area."""
+        """Add a message to the log area, keeping only the last MAX_LOG_LINES."""
         timestamp = time.strftime("%H:%M:%S")
         self.log_text.config(state=self.tk.NORMAL)
         self.log_text.insert(self.tk.END, f"[{timestamp}] {message}\n")
+        lines = int(self.log_text.index('end-1c').split('.')[0])
+        if lines > self.MAX_LOG_LINES:
+            self.log_text.delete('1.0', f'{lines - self.MAX_LOG_LINES}.0')
         self.log_text.config(state=self.tk.DISABLED)
         self.log_text.see(self.tk.END)
-        self.root.update()
+        
+        # Redrawing on every line is expensive during chatty steps
+        now = time.monotonic()
+        if now - self.last_update_ts >= self.UPDATE_INTERVAL:
+            self.last_update_ts = now
+            self.root.update()
         
     def update_progress(self, step, message):
         """Update progress bar and status."""
@@ -511,20 +648,36 @@ class GUILauncher:
                 pass
         self.root.quit()
         
+    def setup_finished(self, console_launcher):
+        """Take over the started server and enable the launch button."""
+        self.server_process = console_launcher.server_process
+        self.server_ready = console_launcher.server_ready
+        
+        self.launch_button.config(state=self.tk.NORMAL)
+        self.status_label.config(text="Ready to launch!")
+        self.log_message("Setup completed successfully!")
+        
     def run_setup(self):
         """Run the setup process using ConsoleLauncher logic."""
         console_launcher = ConsoleLauncher()
         
         def setup_thread():
             try:
+                if self.skip_setup or (not self.is_first_run and stamp_is_current(newer_than=[__file__])):
+                    self.log_message("Setup is up to date - skipping checks")
+                    self.update_progress(5, "Starting server...")
+                    if console_launcher.start_server():
+                        self.setup_finished(console_launcher)
+                    return
+                
                 self.update_progress(1, "Checking Python version...")
                 console_launcher.check_python_version()
-                time.sleep(1)
+                time.sleep(_PACE)
                 
                 self.update_progress(2, "Setting up virtual environment...")
                 if not console_launcher.setup_virtual_environment():
                     return
-                time.sleep(1)
+                time.sleep(_PACE)
                 
                 self.update_progress(3, "Installing dependencies...")
                 if not console_launcher.install_dependencies():
@@ -532,18 +685,12 @@ class GUILauncher:
                 
                 self.update_progress(4, "Checking Tesseract OCR...")
                 console_launcher.check_tesseract()
-                time.sleep(1)
                 
                 self.update_progress(5, "Starting server...")
                 if not console_launcher.start_server():
                     return
                 
-                self.server_process = console_launcher.server_process
-                self.server_ready = console_launcher.server_ready
-                
-                self.launch_button.config(state=self.tk.NORMAL)
-                self.status_label.config(text="Ready to launch!")
-                self.log_message("Setup completed successfully!")
+                self.setup_finished(console_launcher)
                 
             except Exception as e:
                 self.log_message(f"Setup failed: {e}")
@@ -563,21 +710,24 @@ def main():
         print("🚀 KYO QA Tool Enhanced Launcher")
         print("   Checking system capabilities...")
         
+        # --no-setup skips straight to starting the server
+        skip_setup = "--no-setup" in sys.argv[1:]
+        
         # Try GUI first, fallback to console
         if check_gui_availability():
             print("✅ GUI available - starting visual launcher...")
             try:
-                launcher = GUILauncher()
+                launcher = GUILauncher(skip_setup)
                 launcher.run()
             except Exception as e:
                 print(f"❌ GUI launcher failed: {e}")
                 print("🔄 Falling back to console launcher...")
                 launcher = ConsoleLauncher()
-                launcher.run()
+                launcher.run(skip_setup)
         else:
             print("🖥️  Using console launcher...")
             launcher = ConsoleLauncher()
-            launcher.run()
+            launcher.run(skip_setup)
             
     except KeyboardInterrupt:
         print("\n\n👋 Launcher cancelled by user.")
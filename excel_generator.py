@@ -3,13 +3,138 @@
 # Date: 2025-07-19
 # Version: 30.2.0
 
-import pandas as pd
 import os
+import uuid
 import logging
 from datetime import datetime
+from openpyxl import Workbook
+
+# XlsxWriter is optional; without it reports are written with openpyxl.
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 logger = logging.getLogger(__name__)
 
+def _collect_headers(data_list):
+    """Return the union of row keys in first-seen order."""
+    headers = {}
+    for row in data_list:
+        for key in row:
+            headers[key] = None
+    return list(headers)
+
+def _new_report_path(report_id=None):
+    """
+    Return a timestamped path for a new report in the output directory.
+    
+    Args:
+        report_id (str): Added to the filename so reports started in the
+                         same second do not collide; a random ID if omitted.
+    """
+    # Define the output directory and filename
+    output_dir = "processed_output"
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Create a unique filename with a timestamp and the report's ID
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"KYO_QA_Report_{timestamp}_{report_id or uuid.uuid4().hex}.xlsx"
+    return os.path.join(output_dir, filename)
+
+class ExcelReportWriter:
+    """
+    Writes an Excel report one row at a time.
+    
+    Rows are streamed to disk as they are appended: XlsxWriter in
+    constant_memory mode when it is installed, otherwise an openpyxl
+    write-only workbook. The file is only created when the first row
+    arrives, so a report with no rows leaves nothing behind.
+    """
+    
+    def __init__(self, headers=None, report_id=None):
+        """
+        Args:
+            headers (list): Column names. Taken from the first row's keys
+                            when not given.
+            report_id (str): ID put in the report's filename, such as the
+                             job ID; a random ID if omitted.
+        """
+        self.headers = list(headers) if headers else None
+        self.report_id = report_id
+        self.report_path = None
+        self.rows = 0
+        self._workbook = None
+        self._worksheet = None
+    
+    def _open(self):
+        """Create the workbook and write the header row."""
+        self.report_path = _new_report_path(self.report_id)
+        if xlsxwriter is not None:
+            self._workbook = xlsxwriter.Workbook(self.report_path, {
+                'constant_memory': True,
+                'strings_to_urls': False,
+            })
+            self._worksheet = self._workbook.add_worksheet()
+            self._worksheet.write_row(0, 0, self.headers)
+        else:
+            self._workbook = Workbook(write_only=True)
+            self._worksheet = self._workbook.create_sheet()
+            self._worksheet.append(self.headers)
+    
+    def append_row(self, data):
+        """
+        Append one row to the report.
+        
+        Args:
+            data (dict): Row values keyed by column name.
+        """
+        if self._workbook is None:
+            if self.headers is None:
+                self.headers = list(data)
+            self._open()
+        
+        values = [data.get(h) for h in self.headers]
+        if xlsxwriter is not None:
+            self._worksheet.write_row(self.rows + 1, 0, values)
+        else:
+            self._worksheet.append(values)
+        self.rows += 1
+    
+    def close_report(self):
+        """
+        Finish writing the report.
+        
+        Returns:
+            str: The path to the Excel file, or None if no rows were written.
+        """
+        if self._workbook is None:
+            logger.warning("No rows were added. Excel report not created.")
+            return None
+        
+        workbook, self._workbook = self._workbook, None
+        if xlsxwriter is not None:
+            workbook.close()
+        else:
+            workbook.save(self.report_path)
+        
+        logger.info(f"Successfully created Excel report with {self.rows} rows: {self.report_path}")
+        return self.report_path
+
+def open_report(headers=None, report_id=None):
+    """
+    Start a report that rows can be appended to as they are produced.
+    
+    Args:
+        headers (list): Column names; taken from the first row if omitted.
+        report_id (str): ID put in the report's filename, such as the job
+                         ID, so concurrent reports never share a file.
+        
+    Returns:
+        ExcelReportWriter: Call append_row() per row, then close_report().
+    """
+    return ExcelReportWriter(headers, report_id)
+
 def create_excel_report(data_list):
     """
     Creates an Excel spreadsheet from a list of dictionaries.
@@ -31,25 +156,11 @@ def create_excel_report(data_list):
     logger.info(f"Creating Excel report with {len(data_list)} rows.")
     
     try:
-        # Convert the list of dictionaries to a pandas DataFrame
-        df = pd.DataFrame(data_list)
-        
-        # Define the output directory and filename
-        output_dir = "processed_output"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Create a unique filename with a timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"KYO_QA_Report_{timestamp}.xlsx"
-        report_path = os.path.join(output_dir, filename)
-        
-        # Write the DataFrame to an Excel file
-        df.to_excel(report_path, index=False)
-        
-        logger.info(f"Successfully created Excel report: {report_path}")
-        return report_path
+        report = open_report(_collect_headers(data_list))
+        for row in data_list:
+            report.append_row(row)
+        return report.close_report()
         
     except Exception as e:
         logger.error(f"Failed to generate Excel report: {e}", exc_info=True)
         raise
-
@@ -3,6 +3,8 @@
 # Date: 2025-07-19
 # Version: 30.2.0
 
+import queue
+import atexit
 import subprocess
 import threading
 import time
@@ -10,8 +12,10 @@ import webview
 import logging
 import sys
 import os
+import selectors
 import requests
 from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
 
 # --- Centralized Logging Setup ---
 def setup_logging():
@@ -22,37 +26,133 @@ def setup_logging():
     except ImportError:
         __version__ = "30.2.0"
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[
-            logging.FileHandler("kyo_qa_tool.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    # Loggers only enqueue records; a single listener thread formats them
+    # and does the file and console I/O
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    file_handler = logging.FileHandler("kyo_qa_tool.log")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    # The file is written on the listener thread, so it needs no buffering
+    # of its own and the log stays current while the app runs
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
     logging.info(f"--- Starting KYO QA Tool v{__version__} ---")
 
-def wait_for_server(url="http://127.0.0.1:5000", timeout=30):
-    """Wait for the Flask server to be ready."""
+# Set by the server output readers once Flask prints its "Running on" banner
+server_ready = threading.Event()
+
+def _check_ready_line(text):
+    """Signal server_ready if a server output line is Flask's startup banner."""
+    if "Running on" in text:
+        server_ready.set()
+
+# After the banner (or the timeout), readiness is confirmed with up to
+# this many requests, this many seconds apart
+READY_PROBES = 10
+READY_PROBE_INTERVAL = 0.2
+
+def _server_answers(url):
+    """Return True if a GET of url answers with HTTP 200."""
+    try:
+        return requests.get(url, timeout=1).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+def wait_for_server(url="http://127.0.0.1:5000", timeout=30, server_process=None):
+    """
+    Wait for the Flask server to be ready.
+
+    The output readers signal the startup banner, so the wait wakes as
+    soon as it is printed. The server is also probed once a second in case
+    the banner looks different, and a server process that has exited ends
+    the wait straight away.
+
+    Args:
+        url (str): URL that answers 200 once the server is up.
+        timeout (float): Seconds to wait for the banner.
+        server_process (subprocess.Popen): The server, checked for an early exit.
+
+    Returns:
+        bool: True if the server answered.
+    """
     logger = logging.getLogger(__name__)
     logger.info(f"Waiting for server at {url}")
     
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            response = requests.get(url, timeout=2)
-            if response.status_code == 200:
-                logger.info("Server is ready!")
-                return True
-        except requests.exceptions.RequestException:
-            pass
-        
-        time.sleep(1)
-        logger.info(f"Still waiting for server... ({int(time.time() - start_time)}s)")
+    def exited():
+        return server_process is not None and server_process.poll() is not None
+    
+    deadline = time.monotonic() + timeout
+    while not server_ready.wait(min(1.0, max(0.0, deadline - time.monotonic()))):
+        if exited():
+            logger.error(f"Server process exited with code {server_process.returncode}")
+            return False
+        if _server_answers(url):
+            logger.info("Server is ready!")
+            return True
+        if time.monotonic() >= deadline:
+            logger.warning(f"No startup banner from the server within {timeout} seconds")
+            break
+    
+    # A few quick requests to confirm the server actually answers
+    for _ in range(READY_PROBES):
+        if exited():
+            logger.error(f"Server process exited with code {server_process.returncode}")
+            return False
+        if _server_answers(url):
+            logger.info("Server is ready!")
+            return True
+        time.sleep(READY_PROBE_INTERVAL)
     
     logger.error(f"Server failed to respond within {timeout} seconds")
     return False
 
+def _pump_server_output(server_process, logger):
+    """
+    Log the server's stdout and stderr lines from a single thread.
+
+    Both pipes are read without blocking as a selector reports data, and
+    the loop ends once both reach EOF, i.e. when the server exits.
+    """
+    streams = {
+        server_process.stdout.fileno(): (logger.info, "SERVER"),
+        server_process.stderr.fileno(): (logger.error, "SERVER ERROR"),
+    }
+    partial = {fd: b"" for fd in streams}
+    
+    with selectors.DefaultSelector() as selector:
+        for fd in streams:
+            os.set_blocking(fd, False)
+            selector.register(fd, selectors.EVENT_READ)
+        
+        while selector.get_map():
+            for key, _ in selector.select(timeout=0.5):
+                fd = key.fd
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                
+                if chunk:
+                    *lines, partial[fd] = (partial[fd] + chunk).split(b"\n")
+                else:
+                    selector.unregister(fd)
+                    lines, partial[fd] = [partial[fd]], b""
+                
+                log, tag = streams[fd]
+                for line in lines:
+                    text = line.decode("utf-8", errors="replace").strip()
+                    if text:
+                        _check_ready_line(text)
+                        log(f"{tag}: {text}")
+
 def start_server(script_dir):
     """Starts the Flask web server in a separate process."""
     logger = logging.getLogger(__name__)
@@ -82,27 +182,36 @@ def start_server(script_dir):
             creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
         )
         
-        # Monitor server output in a separate thread
-        def log_server_output():
-            while True:
-                output = server_process.stdout.readline()
-                if output == '' and server_process.poll() is not None:
-                    break
-                if output.strip():
-                    logger.info(f"SERVER: {output.strip()}")
-                    
-        def log_server_errors():
-            while True:
-                output = server_process.stderr.readline()
-                if output == '' and server_process.poll() is not None:
-                    break
-                if output.strip():
-                    logger.error(f"SERVER ERROR: {output.strip()}")
-
-        stdout_thread = threading.Thread(target=log_server_output, daemon=True)
-        stderr_thread = threading.Thread(target=log_server_errors, daemon=True)
-        stdout_thread.start()
-        stderr_thread.start()
+        # Monitor server output in the background
+        if os.name != 'nt':
+            # One selector thread serves both pipes
+            threading.Thread(
+                target=_pump_server_output, args=(server_process, logger), daemon=True
+            ).start()
+        else:
+            # Windows cannot select() on pipes, so each gets a reader thread
+            def log_server_output():
+                while True:
+                    output = server_process.stdout.readline()
+                    if output == '' and server_process.poll() is not None:
+                        break
+                    if output.strip():
+                        _check_ready_line(output)
+                        logger.info(f"SERVER: {output.strip()}")
+                        
+            def log_server_errors():
+                while True:
+                    output = server_process.stderr.readline()
+                    if output == '' and server_process.poll() is not None:
+                        break
+                    if output.strip():
+                        _check_ready_line(output)
+                        logger.error(f"SERVER ERROR: {output.strip()}")
+
+            stdout_thread = threading.Thread(target=log_server_output, daemon=True)
+            stderr_thread = threading.Thread(target=log_server_errors, daemon=True)
+            stdout_thread.start()
+            stderr_thread.start()
 
         logger.info("Flask server process started.")
         return server_process
@@ -137,7 +246,7 @@ def main():
             sys.exit(1)
         
         # 3. Wait for server to be ready
-        if not wait_for_server():
+        if not wait_for_server(server_process=server_process):
             logger.error("Server failed to start properly. Exiting.")
             input("Press Enter to exit...")
             sys.exit(1)
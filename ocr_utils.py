@@ -6,15 +6,63 @@
 import fitz  # PyMuPDF
 from PIL import Image
 import pytesseract
-import io
 import logging
 import os
+import json
+import shutil
+import atexit
+import threading
+import functools
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from config import CACHE_DIR
+
+# tesserocr is optional; it runs Tesseract in-process instead of spawning
+# the tesseract binary for every page as pytesseract does.
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
 
 logger = logging.getLogger(__name__)
 
 # --- Tesseract Configuration ---
+# The last Tesseract found by the probe below, so later startups can skip
+# running tesseract just to find it
+TESSERACT_CACHE_FILE = CACHE_DIR / "tesseract_path.json"
+
+def _load_cached_tesseract():
+    """Return the cached Tesseract path if the executable is unchanged, else None."""
+    try:
+        cached = json.loads(TESSERACT_CACHE_FILE.read_text(encoding='utf-8'))
+        if os.path.getmtime(cached["path"]) == cached["mtime"]:
+            return cached["path"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _save_cached_tesseract(path):
+    """Remember a working Tesseract path together with its modification time."""
+    if not path:
+        return
+    try:
+        TESSERACT_CACHE_FILE.write_text(
+            json.dumps({"path": path, "mtime": os.path.getmtime(path)}),
+            encoding='utf-8'
+        )
+    except OSError as e:
+        logger.debug(f"Could not cache Tesseract path: {e}")
+
+@functools.lru_cache(maxsize=1)
 def init_tesseract():
-    """Initialize Tesseract OCR with proper path configuration."""
+    """
+    Locate Tesseract and configure pytesseract to use it.
+
+    Runs on the first OCR call rather than at import, and only once per
+    process.
+
+    Returns:
+        bool: True if Tesseract was found.
+    """
     try:
         from config import TESSERACT_PATH
         if TESSERACT_PATH and os.path.exists(TESSERACT_PATH):
@@ -24,34 +72,172 @@ def init_tesseract():
     except (ImportError, AttributeError):
         logger.warning("TESSERACT_PATH not found in config.py. Trying default locations...")
     
-    # Try common Windows installation paths
-    common_paths = [
+    cached_path = _load_cached_tesseract()
+    if cached_path:
+        pytesseract.pytesseract.tesseract_cmd = cached_path
+        logger.info(f"Tesseract found at: {cached_path} (cached)")
+        return True
+    
+    # A PATH lookup is only a few stat calls, so try it before the
+    # common Windows installation paths
+    candidates = [
+        shutil.which("tesseract"),
         r"C:\Program Files\Tesseract-OCR\tesseract.exe",
         r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-        "tesseract"  # Assume it's in PATH
     ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            pytesseract.pytesseract.tesseract_cmd = path
+            logger.info(f"Tesseract found at: {path}")
+            _save_cached_tesseract(path)
+            return True
     
-    for path in common_paths:
-        try:
-            if path == "tesseract":
-                # Test if tesseract is in PATH
-                pytesseract.pytesseract.tesseract_cmd = "tesseract"
-                # Try a quick test
-                pytesseract.get_tesseract_version()
-                logger.info("Tesseract found in system PATH")
-                return True
-            elif os.path.exists(path):
-                pytesseract.pytesseract.tesseract_cmd = path
-                logger.info(f"Tesseract found at: {path}")
-                return True
-        except Exception:
-            continue
+    # Last resort: let pytesseract try to run it
+    try:
+        pytesseract.pytesseract.tesseract_cmd = "tesseract"
+        pytesseract.get_tesseract_version()
+        logger.info("Tesseract found in system PATH")
+        return True
+    except (pytesseract.TesseractNotFoundError, OSError):
+        pass
     
     logger.error("Tesseract OCR not found. Please install Tesseract or update the path in config.py")
     return False
 
-# Initialize Tesseract on module import
-TESSERACT_AVAILABLE = init_tesseract()
+# --- Parallel OCR ---
+# Tesseract is single-threaded per page, so image-only pages are OCR'd in
+# a process pool shared by all documents. It is created on first use.
+_OCR_POOL = None
+_OCR_POOL_LOCK = threading.Lock()
+_OCR_WORKERS = os.cpu_count() or 1
+
+# Rendered pages waiting for OCR hold up to ~9 MB each, so only this
+# many are kept in flight per document
+_MAX_PAGES_IN_FLIGHT = 2 * _OCR_WORKERS
+
+# Cleared in worker processes that already run one document per core, so
+# they do not each start a nested page pool
+_PAGE_POOL_ENABLED = True
+
+def disable_page_pool():
+    """OCR pages in the calling process. Used as a process pool initializer."""
+    global _PAGE_POOL_ENABLED
+    _PAGE_POOL_ENABLED = False
+
+def _get_ocr_pool():
+    """Return the shared OCR process pool, creating it if needed."""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is None:
+            _OCR_POOL = ProcessPoolExecutor(max_workers=_OCR_WORKERS)
+            atexit.register(_OCR_POOL.shutdown, wait=False)
+        return _OCR_POOL
+
+def _run_inline(fn, *args):
+    """Run fn now and return its outcome as a completed Future."""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+# One long-lived tesserocr API per worker process, so the language data is
+# loaded once per worker rather than once per page
+_TESS_API = None
+
+def _get_tess_api():
+    """Return this process's tesserocr API, or None if it cannot be used."""
+    global _TESS_API, tesserocr
+    if _TESS_API is None and tesserocr is not None:
+        try:
+            _TESS_API = tesserocr.PyTessBaseAPI(lang="eng", psm=tesserocr.PSM.AUTO)
+        except Exception as e:
+            logger.warning(f"tesserocr could not be initialized, using pytesseract: {e}")
+            tesserocr = None
+    return _TESS_API
+
+def _ocr_page(samples, width, height, mode):
+    """
+    OCR one rendered page in a worker process.
+
+    Args:
+        samples (bytes): Raw pixel data from the pixmap.
+        width (int): Page width in pixels.
+        height (int): Page height in pixels.
+        mode (str): Pillow image mode matching the samples.
+
+    Returns:
+        str: The recognized text.
+    """
+    img = Image.frombytes(mode, (width, height), samples)
+    api = _get_tess_api()
+    if api is not None:
+        api.SetImage(img)
+        return api.GetUTF8Text()
+    # Worker processes need their own pytesseract configuration
+    init_tesseract()
+    return pytesseract.image_to_string(img, lang='eng')
+
+# Pages with at least this much direct text are never OCR'd
+MIN_CHARS_PER_PAGE = 40
+
+# Pages whose text blocks cover more than this fraction of the page are
+# treated as born-digital even when they hold little text
+MIN_TEXT_COVERAGE = 0.5
+
+def _needs_ocr(page, direct_text):
+    """
+    Decide whether a page has to be OCR'd or its direct text is enough.
+
+    Args:
+        page (fitz.Page): The page to check.
+        direct_text (str): Text already extracted from the page.
+
+    Returns:
+        bool: True if the page should be rasterized and OCR'd.
+    """
+    if len(direct_text) >= MIN_CHARS_PER_PAGE:
+        return False
+    
+    # Without images there is nothing for OCR to find
+    if not page.get_images(full=False):
+        return False
+    
+    page_area = abs(page.rect)
+    if not page_area:
+        return True
+    text_area = sum(
+        abs(fitz.Rect(block[:4]))
+        for block in page.get_text("blocks")
+        if block[6] == 0  # Text blocks only, not image blocks
+    )
+    return text_area / page_area <= MIN_TEXT_COVERAGE
+
+# Rendering DPI bounds for OCR. Rendering above a scan's own resolution
+# only adds pixels Tesseract cannot use, and the cost grows with DPI².
+MAX_OCR_DPI = 300
+MIN_OCR_DPI = 150
+
+def _ocr_dpi(page):
+    """
+    Pick a rendering DPI for OCR from the page's embedded images.
+
+    The effective resolution of an image is its pixel width over the
+    width it is drawn at. The largest one on the page is used, clamped to
+    [MIN_OCR_DPI, MAX_OCR_DPI]. Pages without usable image information
+    are rendered at MAX_OCR_DPI, as before.
+    """
+    best = 0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"])
+        if bbox.width > 0 and bbox.height > 0:
+            xres = info["width"] * 72 / bbox.width
+            yres = info["height"] * 72 / bbox.height
+            best = max(best, xres, yres)
+    if not best:
+        return MAX_OCR_DPI
+    return int(min(MAX_OCR_DPI, max(MIN_OCR_DPI, best)))
 
 def process_single_document(filepath):
     """
@@ -68,52 +254,67 @@ def process_single_document(filepath):
     """
     logger.info(f"Starting OCR process for: {os.path.basename(filepath)}")
     
-    if not TESSERACT_AVAILABLE:
+    if not init_tesseract():
         raise Exception("Tesseract OCR is not available. Please install and configure Tesseract.")
     
-    full_text = ""
-    
     try:
-        doc = fitz.open(filepath)
-        
-        # Check if document is encrypted
-        if doc.is_encrypted:
-            doc.close()
-            raise Exception("Document is password protected and cannot be processed.")
+        ocr_futures = {}
+        in_flight = set()
+        submit = _get_ocr_pool().submit if _PAGE_POOL_ENABLED else _run_inline
         
-        total_pages = len(doc)
-        logger.info(f"Processing {total_pages} pages...")
+        # The context manager closes the document on every path, including
+        # the encrypted check and unexpected errors
+        with fitz.open(filepath) as doc:
+            # Check if document is encrypted
+            if doc.is_encrypted:
+                raise Exception("Document is password protected and cannot be processed.")
+            
+            total_pages = len(doc)
+            logger.info(f"Processing {total_pages} pages...")
+            
+            # Text of each page in order; OCR results are filled in as they finish
+            page_texts = [None] * total_pages
+            
+            # Iterating the document hands out one page at a time, and each
+            # page and pixmap is dropped as soon as it has been handled
+            for page_num, page in enumerate(doc):
+                try:
+                    # Try to extract text directly first (faster for text-based PDFs)
+                    direct_text = page.get_text().strip()
+                    if not _needs_ocr(page, direct_text):
+                        page_texts[page_num] = direct_text
+                        logger.debug(f"Extracted text directly from page {page_num + 1}")
+                    else:
+                        # Use OCR for image-based content
+                        logger.debug(f"Using OCR for page {page_num + 1}")
+                        if len(in_flight) >= _MAX_PAGES_IN_FLIGHT:
+                            _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        
+                        # Render at the scan's own resolution (up to 300 DPI) in
+                        # grayscale, because Tesseract binarizes anyway and it is
+                        # a third of the size
+                        pix = page.get_pixmap(dpi=_ocr_dpi(page), colorspace=fitz.csGRAY)
+                        # Hand the raw samples to Pillow instead of a PNG round trip
+                        mode = "L" if pix.n == 1 else ("RGB" if pix.alpha == 0 else "RGBA")
+                        future = submit(_ocr_page, pix.samples, pix.width, pix.height, mode)
+                        pix = None
+                        ocr_futures[page_num] = future
+                        in_flight.add(future)
+                            
+                except Exception as page_error:
+                    logger.warning(f"Failed to process page {page_num + 1}: {page_error}")
+                finally:
+                    page = None
         
-        for page_num in range(total_pages):
+        for page_num, future in ocr_futures.items():
             try:
-                page = doc.load_page(page_num)
-                
-                # Try to extract text directly first (faster for text-based PDFs)
-                direct_text = page.get_text().strip()
-                if direct_text:
-                    full_text += direct_text + "\n\n"
-                    logger.debug(f"Extracted text directly from page {page_num + 1}")
-                else:
-                    # Use OCR for image-based content
-                    logger.debug(f"Using OCR for page {page_num + 1}")
-                    pix = page.get_pixmap(dpi=300)  # Higher DPI for better OCR accuracy
-                    img = Image.open(io.BytesIO(pix.tobytes("png")))
-                    
-                    try:
-                        page_text = pytesseract.image_to_string(img, lang='eng')
-                        full_text += page_text + "\n\n"
-                    except pytesseract.TesseractNotFoundError:
-                        logger.error("Tesseract is not installed or not in your PATH.")
-                        raise Exception("Tesseract OCR is not installed or configured correctly.")
-                    except Exception as ocr_error:
-                        logger.warning(f"OCR failed on page {page_num + 1}: {ocr_error}")
-                        continue
-                        
-            except Exception as page_error:
-                logger.warning(f"Failed to process page {page_num + 1}: {page_error}")
-                continue
-
-        doc.close()
+                page_texts[page_num] = future.result()
+            except pytesseract.TesseractNotFoundError:
+                logger.error("Tesseract is not installed or not in your PATH.")
+            except Exception as ocr_error:
+                logger.warning(f"OCR failed on page {page_num + 1}: {ocr_error}")
+        
+        full_text = "\n\n".join(text for text in page_texts if text is not None)
         
         if not full_text.strip():
             raise Exception("No text could be extracted from the document.")
@@ -6,31 +6,203 @@
 import logging
 import time
 import os
+import functools
+import queue
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 
 # --- Corrected Imports ---
 # Import from the renamed modules
-from ocr_utils import process_single_document
+from ocr_utils import process_single_document, disable_page_pool, init_tesseract
 from data_harvesters import find_patterns
-from excel_generator import create_excel_report
-from file_utils import handle_zip_file
+from excel_generator import open_report
+from file_utils import count_zip_pdfs, handle_zip_file, prefetch_files
 from custom_exceptions import DocumentProcessingError
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks for newly extracted ZIP members while archives
+# are being extracted
+LANDED_POLL_INTERVAL = 0.2
+
+def _publish_progress(job_id, jobs, messages):
+    """Append messages to a job's log and recompute its progress in one update."""
+    # Hold the job's shard lock so the log append and progress
+    # recalculation are seen by status polls as one update.
+    with jobs.shard_for(job_id) as shard:
+        job = shard.get(job_id)
+        if job is None:
+            return
+        job['log'].extend(messages)
+        
+        # Update progress percentage
+        processed = job['processed_files']
+        total = job['total_files']
+        if total > 0:
+            job['progress'] = int((processed / total) * 100)
+
 def update_job_progress(job_id, jobs, message, is_error=False):
     """Helper function to update the progress and log of a job."""
-    if job_id in jobs:
-        jobs[job_id]['log'].append(message)
+    _publish_progress(job_id, jobs, [message])
+    
+    if is_error:
+        logger.error(message)
+    else:
+        logger.info(message)
+
+class JobProgress:
+    """
+    Batches a job's log messages before publishing them to the job store.
+
+    Messages are logged right away but only appended to the shared job,
+    together with a progress recompute, every FLUSH_COUNT messages or
+    FLUSH_INTERVAL seconds, or when flush() is called.
+    """
+    FLUSH_COUNT = 16
+    FLUSH_INTERVAL = 0.25
+
+    def __init__(self, job_id, jobs):
+        self.job_id = job_id
+        self.jobs = jobs
+        self.pending = []
+        self.last_flush = time.monotonic()
+
+    def log(self, message, is_error=False):
+        """Queue a message for the job log and write it to the application log."""
+        self.pending.append(message)
         if is_error:
             logger.error(message)
         else:
             logger.info(message)
         
-        # Update progress percentage
-        processed = jobs[job_id]['processed_files']
-        total = jobs[job_id]['total_files']
-        if total > 0:
-            jobs[job_id]['progress'] = int((processed / total) * 100)
+        if (len(self.pending) >= self.FLUSH_COUNT
+                or time.monotonic() - self.last_flush > self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Publish queued messages and the current progress to the job."""
+        _publish_progress(self.job_id, self.jobs, self.pending)
+        self.pending = []
+        self.last_flush = time.monotonic()
+
+def _init_worker():
+    """
+    Prepare a document worker process before its first task.
+
+    The model and QA patterns are compiled once when data_harvesters is
+    imported and reused by every find_patterns() call in the process, and
+    Tesseract is located here too, so neither cost lands on the first
+    document.
+    """
+    disable_page_pool()
+    init_tesseract()
+
+# Documents from all jobs share one process pool with a worker per core,
+# created on first use, so concurrent jobs cannot multiply the number of
+# OCR processes and each worker imports fitz and finds Tesseract only
+# once. On POSIX the workers come from a forkserver that has already
+# imported this module, rather than being forked from the threaded server.
+_DOC_POOL = None
+_DOC_POOL_LOCK = threading.Lock()
+_DOC_WORKERS = os.cpu_count() or 1
+
+def _get_document_pool():
+    """Return the shared document process pool, creating it if needed."""
+    global _DOC_POOL
+    with _DOC_POOL_LOCK:
+        if _DOC_POOL is None:
+            context = None
+            if os.name != 'nt':
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload([__name__])
+            _DOC_POOL = ProcessPoolExecutor(
+                max_workers=_DOC_WORKERS, mp_context=context, initializer=_init_worker
+            )
+            atexit.register(_DOC_POOL.shutdown, wait=False)
+        return _DOC_POOL
+
+def _submit_document(filepath):
+    """
+    Queue a document on the shared pool and return its future.
+
+    A pool whose worker died (for example killed for running out of
+    memory) rejects new work, so it is replaced once and the document
+    resubmitted.
+    """
+    global _DOC_POOL
+    pool = _get_document_pool()
+    try:
+        return pool.submit(_process_document, filepath)
+    except BrokenProcessPool:
+        logger.warning("Document process pool is broken; starting a new one")
+        with _DOC_POOL_LOCK:
+            if _DOC_POOL is pool:
+                _DOC_POOL = None
+        return _get_document_pool().submit(_process_document, filepath)
+
+def _process_document(filepath):
+    """
+    OCR one document and extract its data.
+
+    Runs in a worker process, so it only returns plain data; the job
+    itself is updated by the caller.
+
+    Args:
+        filepath (str): Path to the document.
+
+    Returns:
+        dict: The patterns found in the document.
+    """
+    document_text = process_single_document(filepath)
+    return find_patterns(document_text)
+
+def _record_result(job, progress, filename, future):
+    """
+    Store the outcome of one finished document on the job.
+
+    The result and the processed file count are updated together under
+    the job's shard lock, so status polls never see one without the other.
+
+    Returns:
+        dict or None: The extracted data if the document succeeded.
+    """
+    found_data = None
+    result = None
+    try:
+        # Steps 1 and 2: OCR and pattern search ran in the worker
+        found_data = future.result()
+        found_data['filename'] = filename # Add filename to the results
+        
+        # Step 3: Add result to the list
+        result = {'filename': filename, 'status': 'success', 'data': found_data}
+        progress.log(f"Successfully processed: {filename}")
+
+    except DocumentProcessingError as e:
+        # Handle custom errors for files that need review
+        found_data = None
+        result = {'filename': filename, 'status': 'review', 'reason': str(e)}
+        progress.log(f"File needs review {filename}: {e}", is_error=True)
+        
+    except Exception as e:
+        # Handle unexpected errors
+        found_data = None
+        result = {'filename': filename, 'status': 'error', 'reason': str(e)}
+        progress.log(f"An unexpected error occurred with {filename}: {e}", is_error=True)
+    
+    finally:
+        # Increment the processed file count regardless of outcome
+        with progress.jobs.shard_for(progress.job_id):
+            if result is not None:
+                job['results'].append(result)
+            job['processed_files'] += 1
+        # Recalculate progress after each file
+        progress.log(f"Finished with {filename}.")
+        progress.flush()
+    
+    return found_data
 
 def process_files(job_id, filepaths, jobs):
     """
@@ -42,70 +214,152 @@ def process_files(job_id, filepaths, jobs):
         logger.error(f"Job {job_id} not found. Aborting processing.")
         return
 
-    job['status'] = 'processing'
-    update_job_progress(job_id, jobs, "Processing job started.")
+    with jobs.shard_for(job_id):
+        job['status'] = 'processing'
+    progress = JobProgress(job_id, jobs)
+    progress.log("Processing job started.")
 
-    all_results = []
+    # Successful results are streamed into the report as they arrive
+    report = open_report(report_id=job_id)
+    report_error = None
     
-    # Expand any ZIP files into the list of filepaths
-    expanded_filepaths = []
-    for path in filepaths:
-        if path.lower().endswith('.zip'):
-            try:
-                unzipped_files = handle_zip_file(path)
-                expanded_filepaths.extend(unzipped_files)
-                update_job_progress(job_id, jobs, f"Extracted {len(unzipped_files)} files from {os.path.basename(path)}.")
-            except Exception as e:
-                update_job_progress(job_id, jobs, f"Failed to extract ZIP file {os.path.basename(path)}: {e}", is_error=True)
-        else:
-            expanded_filepaths.append(path)
-            
-    # Update total file count after expansion
-    job['total_files'] = len(expanded_filepaths)
-
-    for filepath in expanded_filepaths:
-        filename = os.path.basename(filepath)
-        update_job_progress(job_id, jobs, f"Starting to process: {filename}")
-        
+    zip_paths = [path for path in filepaths if path.lower().endswith('.zip')]
+    document_paths = [path for path in filepaths if not path.lower().endswith('.zip')]
+    
+    # The total is known up front from the archives' directories, so
+    # progress never moves backwards. An archive that cannot be read is
+    # reported when extraction fails and counts as empty.
+    expected = {}
+    for path in zip_paths:
         try:
-            # Step 1: Perform OCR and get text
-            document_text = process_single_document(filepath)
-            
-            # Step 2: Find patterns in the extracted text
-            found_data = find_patterns(document_text)
-            found_data['filename'] = filename # Add filename to the results
+            expected[path] = count_zip_pdfs(path)
+        except Exception:
+            expected[path] = 0
+    landed_counts = dict.fromkeys(zip_paths, 0)
+    with jobs.shard_for(job_id):
+        job['total_files'] = len(document_paths) + sum(expected.values())
+
+    # Several documents are spread across the shared document pool, each
+    # worker OCR-ing its own pages. A single document is handled on a
+    # thread here and its pages are OCR'd on the shared page pool instead.
+    if zip_paths or len(document_paths) > 1:
+        executor = None
+        submit = _submit_document
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+        submit = functools.partial(executor.submit, _process_document)
+    
+    # ZIP archives are extracted in the background, so OCR of the plain
+    # documents (and of earlier archives) overlaps the extraction
+    unzipper = ThreadPoolExecutor(max_workers=4) if zip_paths else None
+
+    futures = {}
+    
+    # Each PDF is submitted by the extracting thread as soon as it lands;
+    # its future is handed back here to be tracked. Extraction blocks once
+    # twice as many extracted documents as workers are still unprocessed,
+    # so a large archive is not unpacked far ahead of OCR.
+    landed = queue.SimpleQueue()
+    in_flight = threading.BoundedSemaphore(2 * _DOC_WORKERS) if zip_paths else None
+    
+    def submit_extracted(zip_path, path):
+        in_flight.acquire()
+        future = submit(path)
+        future.add_done_callback(lambda _: in_flight.release())
+        landed.put((zip_path, path, future))
+    
+    def submit_documents(paths):
+        """Queue documents for processing and return their futures."""
+        # Start reading the files in the background while earlier ones are OCR'd
+        prefetch_files(paths)
+        submitted = []
+        for filepath in paths:
+            filename = os.path.basename(filepath)
+            progress.log(f"Starting to process: {filename}")
+            future = submit(filepath)
+            futures[future] = filename
+            submitted.append(future)
+        return submitted
+
+    try:
+        extractions = {}
+        if unzipper is not None:
+            extractions = {
+                unzipper.submit(handle_zip_file, path, functools.partial(submit_extracted, path)): path
+                for path in zip_paths
+            }
+        pending = set(extractions)
+        pending.update(submit_documents(document_paths))
+        progress.flush()
+
+        # Job state is only updated here, in this thread, as results arrive,
+        # and always under the job's shard lock. While archives are still extracting, the loop also wakes on a
+        # short interval so newly landed documents are counted and tracked
+        # right away instead of when something else finishes.
+        while pending:
+            timeout = LANDED_POLL_INTERVAL if pending & extractions.keys() else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
             
-            # Step 3: Add result to the list
-            all_results.append(found_data)
-            job['results'].append({'filename': filename, 'status': 'success', 'data': found_data})
-            update_job_progress(job_id, jobs, f"Successfully processed: {filename}")
-
-        except DocumentProcessingError as e:
-            # Handle custom errors for files that need review
-            job['results'].append({'filename': filename, 'status': 'review', 'reason': str(e)})
-            update_job_progress(job_id, jobs, f"File needs review {filename}: {e}", is_error=True)
+            # Track the documents extracted since the last wake-up. Their
+            # archive's future only completes after all of them are queued.
+            if not landed.empty():
+                while not landed.empty():
+                    zip_path, path, future = landed.get()
+                    filename = os.path.basename(path)
+                    progress.log(f"Starting to process: {filename}")
+                    landed_counts[zip_path] += 1
+                    futures[future] = filename
+                    pending.add(future)
+                progress.flush()
             
-        except Exception as e:
-            # Handle unexpected errors
-            job['results'].append({'filename': filename, 'status': 'error', 'reason': str(e)})
-            update_job_progress(job_id, jobs, f"An unexpected error occurred with {filename}: {e}", is_error=True)
-        
-        finally:
-            # Increment the processed file count regardless of outcome
-            job['processed_files'] += 1
-            # Recalculate progress after each file
-            update_job_progress(job_id, jobs, f"Finished with {filename}.")
+            for future in done:
+                if future in extractions:
+                    zip_path = extractions[future]
+                    zip_name = os.path.basename(zip_path)
+                    # Members that never landed (the archive failed part way,
+                    # or did not match its directory) drop out of the total
+                    missing = expected[zip_path] - landed_counts[zip_path]
+                    if missing:
+                        with jobs.shard_for(job_id):
+                            job['total_files'] -= missing
+                    try:
+                        unzipped_files = future.result()
+                    except Exception as e:
+                        progress.log(f"Failed to extract ZIP file {zip_name}: {e}", is_error=True)
+                        continue
+                    progress.log(f"Extracted {len(unzipped_files)} files from {zip_name}.")
+                    progress.flush()
+                else:
+                    found_data = _record_result(job, progress, futures[future], future)
+                    if found_data is not None and report_error is None:
+                        try:
+                            report.append_row(found_data)
+                        except Exception as e:
+                            report_error = e
+                            progress.log(f"Failed to create Excel report: {e}", is_error=True)
+    finally:
+        if unzipper is not None:
+            unzipper.shutdown()
+        if executor is not None:
+            executor.shutdown()
 
-    # Step 4: Create Excel report from all successfully processed files
+    # Step 4: Finish the Excel report of all successfully processed files
+    # (a failure while appending rows has already been reported)
     try:
-        if any(res.get('status') == 'success' for res in job['results']):
-            report_path = create_excel_report(all_results)
-            update_job_progress(job_id, jobs, f"Excel report created at: {report_path}")
-        else:
-            update_job_progress(job_id, jobs, "No files were processed successfully, skipping Excel report generation.")
+        report_path = report.close_report()
+        if report_error is None:
+            if report_path:
+                with jobs.shard_for(job_id):
+                    job['report_path'] = os.path.abspath(report_path)
+                progress.log(f"Excel report created at: {report_path}")
+            else:
+                progress.log("No files were processed successfully, skipping Excel report generation.")
     except Exception as e:
-        update_job_progress(job_id, jobs, f"Failed to create Excel report: {e}", is_error=True)
+        if report_error is None:
+            progress.log(f"Failed to create Excel report: {e}", is_error=True)
 
-    job['status'] = 'complete'
-    update_job_progress(job_id, jobs, "Processing job finished.")
+    progress.log("Processing job finished.")
+    progress.flush()
+    with jobs.shard_for(job_id):
+        job['status'] = 'complete'
 
@@ -6,9 +6,81 @@
 import os
 import sys
 import time
+import shutil
+import socket
+import functools
 import threading
 import subprocess
+import importlib
+import importlib.util
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from setup_stamp import requirements_hash, stamp_is_current, write_stamp
+
+# On POSIX, subprocess starts children with posix_spawn (vfork-style, so the
+# launcher's address space, tkinter included, is not copied) only when
+# close_fds is False and no cwd, preexec_fn or new session is requested.
+# File descriptors are non-inheritable by default, so nothing leaks into
+# the children.
+_SPAWN_KWARGS = {} if os.name == 'nt' else {"close_fds": False}
+
+def _spawn(argv, **kwargs):
+    """subprocess.Popen() that stays on the posix_spawn fast path."""
+    return subprocess.Popen(argv, **_SPAWN_KWARGS, **kwargs)
+
+def _read_tail(stream, tail):
+    """Read a binary pipe in chunks until EOF, keeping the last chunks in tail."""
+    for chunk in iter(lambda: stream.read1(4096), b""):
+        tail.append(chunk)
+
+def _run_bounded(argv, timeout=None, check=False, tail_bytes=4096):
+    """
+    Run a command like subprocess.run(), keeping only the end of its stderr.
+
+    stdout is discarded and stderr is read in chunks into a bounded deque,
+    so chatty commands such as pip neither fill memory nor stall on a full
+    pipe. Only the tail was ever shown to the user anyway.
+
+    Args:
+        argv (list): The command to run.
+        timeout (float): Seconds before the command is killed.
+        check (bool): Raise CalledProcessError on a non-zero exit code.
+        tail_bytes (int): How much of the end of stderr to keep.
+
+    Returns:
+        subprocess.CompletedProcess: With stderr set to the decoded tail.
+    """
+    process = _spawn(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    tail = deque(maxlen=max(1, tail_bytes // 64))
+    reader = threading.Thread(target=_read_tail, args=(process.stderr, tail), daemon=True)
+    reader.start()
+    try:
+        returncode = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        reader.join(timeout=5)
+        process.stderr.close()
+    
+    stderr = b"".join(tail)[-tail_bytes:].decode("utf-8", errors="replace")
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, argv, stderr=stderr)
+    return subprocess.CompletedProcess(argv, returncode, stderr=stderr)
+
+# The last formatted log timestamp, reused until the second changes
+_TIMESTAMP_CACHE = (0, "")
+
+def _timestamp():
+    """Return the current time as HH:MM:SS, formatting it at most once a second."""
+    global _TIMESTAMP_CACHE
+    now = int(time.time())
+    if now != _TIMESTAMP_CACHE[0]:
+        _TIMESTAMP_CACHE = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    return _TIMESTAMP_CACHE[1]
 
 def print_banner():
     """Print a nice console banner."""
@@ -18,50 +90,117 @@ def print_banner():
     print("="*70)
 
 def check_gui_availability():
-    """Check if GUI (tkinter) is available."""
-    try:
-        import tkinter as tk
-        # Try to create a simple test window
-        root = tk.Tk()
-        root.withdraw()  # Hide it immediately
-        root.destroy()
+    """
+    Check if GUI (tkinter) is available.
+    
+    Only checks that tkinter is installed and a display is likely present;
+    no Tk window is created here. If Tk still cannot start, GUILauncher
+    fails in __init__ and main() falls back to the console launcher.
+    """
+    if importlib.util.find_spec("tkinter") is None:
+        reason = "tkinter is not installed"
+    elif os.name == 'nt' or sys.platform == 'darwin' or os.environ.get("DISPLAY"):
         return True
-    except Exception as e:
-        print(f"⚠️  GUI not available: {e}")
-        print("   Falling back to console mode...")
-        return False
+    else:
+        reason = "no display available"
+    
+    print(f"⚠️  GUI not available: {reason}")
+    print("   Falling back to console mode...")
+    return False
 
+@functools.lru_cache(maxsize=1)
 def check_requests_availability():
-    """Check if requests module is available, install if needed."""
-    try:
-        import requests
-        return True, requests
-    except ImportError:
+    """
+    Check if requests module is available, install if needed.
+    
+    The result is cached, so the server polling loop probes (and, if
+    requests is missing, tries to install it) only once.
+    """
+    if importlib.util.find_spec("requests") is None:
         print("📦 Installing requests module (required for server checks)...")
         try:
             # Try to install requests
-            subprocess.run(
+            _run_bounded(
                 [sys.executable, "-m", "pip", "install", "requests"],
-                capture_output=True,
                 check=True,
                 timeout=60
             )
-            import requests
+            importlib.invalidate_caches()
             print("✅ Requests module installed successfully")
-            return True, requests
         except Exception as e:
             print(f"⚠️  Could not install requests: {e}")
             print("   Will use alternative server checking method")
             return False, None
+    
+    try:
+        return True, importlib.import_module("requests")
+    except ImportError as e:
+        print(f"⚠️  Could not import requests: {e}")
+        print("   Will use alternative server checking method")
+        return False, None
+
+# Touched after each successful pip self-upgrade
+PIP_UPGRADE_STAMP = Path("venv") / ".pip_upgraded"
+PIP_UPGRADE_INTERVAL = 7 * 24 * 60 * 60  # One week, in seconds
+
+def _write_stamp(path, content):
+    """Write a stamp file; failures only mean the next run does more work."""
+    if content is None:
+        return
+    try:
+        path.write_text(content)
+    except OSError:
+        pass
+
+def _pip_recently_upgraded():
+    """Return True if pip was upgraded within PIP_UPGRADE_INTERVAL."""
+    try:
+        return time.time() - PIP_UPGRADE_STAMP.stat().st_mtime < PIP_UPGRADE_INTERVAL
+    except OSError:
+        return False
+
+def _drain(stream, ring, wake=None):
+    """
+    Read a server pipe line by line until EOF, keeping the last lines in ring.
+
+    If wake is given, it is set when Flask prints its "Running on" banner
+    or when the pipe closes because the server exited.
+    """
+    for line in stream:
+        line = line.rstrip()
+        if line:
+            ring.append(line)
+            if wake is not None and "Running on" in line:
+                wake.set()
+    if wake is not None:
+        wake.set()
+
+def _tcp_ready(host, port, timeout=0.2):
+    """Return True if a TCP connection to host:port is accepted."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+# One keep-alive session shared by all server probes; created on first use
+_SESSION = None
 
 def check_server_with_requests(url, timeout=2):
     """Check server using requests module."""
+    global _SESSION
     try:
         has_requests, requests = check_requests_availability()
         if not has_requests:
             return False
         
-        response = requests.get(url, timeout=timeout)
+        if _SESSION is None:
+            _SESSION = requests.Session()
+            # A single pooled connection and no retries, so a probe fails fast
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+            _SESSION.mount("http://", adapter)
+        
+        response = _SESSION.get(url, timeout=timeout)
         return response.status_code == 200
     except Exception:
         return False
@@ -92,17 +231,102 @@ def check_server_ready(url="http://127.0.0.1:5000", timeout=2):
     
     return False
 
+# Fetched once the server is ready. The readiness check has already
+# rendered index.html, so this covers the rest of the first page load.
+WARMUP_PATHS = ["/app.js"]
+
+def warm_up_server(url="http://127.0.0.1:5000"):
+    """Request the page's other assets so the first window load hits a warm server."""
+    for path in WARMUP_PATHS:
+        if _SESSION is not None:
+            try:
+                _SESSION.get(url + path, timeout=2)
+            except Exception:
+                pass
+        else:
+            check_server_with_urllib(url + path)
+
+def find_tesseract():
+    """
+    Look for Tesseract OCR without touching the venv.
+
+    Returns:
+        str: The path to the tesseract executable, or None.
+    """
+    # shutil.which only stats candidates on PATH; running tesseract is not
+    # needed to know it is installed
+    tesseract_paths = [
+        r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe"
+    ]
+    return shutil.which("tesseract") or next(
+        (path for path in tesseract_paths if os.path.exists(path)), None
+    )
+
 class ConsoleLauncher:
     """Console-based launcher with robust error handling."""
     
-    def __init__(self):
-        self.is_first_run = not Path("venv").exists()
+    def __init__(self, venv_process=None):
+        """
+        Args:
+            venv_process (subprocess.Popen): A "python -m venv venv" already
+                started by main(), waited on in setup_virtual_environment().
+        """
+        # The venv folder appears as soon as venv_process starts, so it
+        # only counts as existing if nothing is still creating it
+        self._venv_process = venv_process
+        self.is_first_run = venv_process is not None or not Path("venv").exists()
+        
+        # venv paths, resolved once for the platform
+        self.venv_bin = Path("venv") / ("Scripts" if os.name == 'nt' else "bin")
+        suffix = ".exe" if os.name == 'nt' else ""
+        self.venv_python = self.venv_bin / f"python{suffix}"
+        self.venv_pip = self.venv_bin / f"pip{suffix}"
+        self._venv_ready = False
+        
         self.server_process = None
         self.server_ready = False
+        self._stdout_ring = deque(maxlen=200)
+        self._stderr_ring = deque(maxlen=200)
+        self._drain_threads = []
+        self._server_wake = threading.Event()
+        
+        # webview can take a noticeable time to import, so start importing
+        # it now; setup and the launch prompt hide the delay
+        self._webview = None
+        self._webview_error = None
+        self._webview_preimport = threading.Thread(target=self._try_import_webview, daemon=True)
+        self._webview_preimport.start()
+        
+    def _try_import_webview(self):
+        """Import webview in the background, remembering the module or the error."""
+        try:
+            import webview
+            self._webview = webview
+        except Exception as e:
+            self._webview_error = e
+            
+    def get_webview(self):
+        """Wait for the background import and return webview, re-raising its error."""
+        self._webview_preimport.join()
+        if self._webview is None:
+            raise self._webview_error
+        return self._webview
+        
+    def venv_is_ready(self):
+        """Return True if the venv's python and pip exist, logging an error if not."""
+        # Once the venv is known to be complete there is no need to stat again
+        if not self._venv_ready:
+            for path in (self.venv_python, self.venv_pip):
+                if not path.exists():
+                    self.log_message(f"{path.stem.capitalize()} not found at {path}", "ERROR")
+                    return False
+            self._venv_ready = True
+        return True
         
     def log_message(self, message, level="INFO"):
         """Print a formatted log message."""
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = _timestamp()
         prefix = {
             "INFO": "ℹ️ ",
             "SUCCESS": "✅",
@@ -133,7 +357,6 @@ class ConsoleLauncher:
         else:
             self.log_message(f"Python {version.major}.{version.minor}.{version.micro} - OK", "SUCCESS")
         
-        time.sleep(1)
         return True
         
     def setup_virtual_environment(self):
@@ -142,13 +365,14 @@ class ConsoleLauncher:
             self.update_progress(2, 6, "Creating virtual environment...")
             
             try:
-                result = subprocess.run(
-                    [sys.executable, "-m", "venv", "venv"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    timeout=120
-                )
+                if self._venv_process is not None:
+                    self.wait_for_venv_process()
+                else:
+                    _run_bounded(
+                        [sys.executable, "-m", "venv", "venv"],
+                        check=True,
+                        timeout=120
+                    )
                 self.log_message("Virtual environment created successfully", "SUCCESS")
             except subprocess.TimeoutExpired:
                 self.log_message("Virtual environment creation timed out", "ERROR")
@@ -165,63 +389,88 @@ class ConsoleLauncher:
             self.update_progress(2, 6, "Virtual environment exists - OK")
             self.log_message("Using existing virtual environment", "SUCCESS")
             
-        time.sleep(1)
         return True
         
+    def wait_for_venv_process(self):
+        """Wait for the venv creation started by main(), raising like _run_bounded(check=True)."""
+        process, self._venv_process = self._venv_process, None
+        try:
+            _, stderr = process.communicate(timeout=120)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, process.args,
+                stderr=stderr.decode("utf-8", errors="replace")[-4096:]
+            )
+        
     def install_dependencies(self):
         """Install Python dependencies with better error handling."""
         self.update_progress(3, 6, "Installing/checking dependencies...")
         
-        # Determine pip executable path
-        if os.name == 'nt':  # Windows
-            pip_path = Path("venv") / "Scripts" / "pip.exe"
-            python_path = Path("venv") / "Scripts" / "python.exe"
-        else:  # Unix-like
-            pip_path = Path("venv") / "bin" / "pip"
-            python_path = Path("venv") / "bin" / "python"
-        
-        if not pip_path.exists():
-            self.log_message(f"Pip not found at {pip_path}", "ERROR")
+        if not self.venv_is_ready():
             return False
             
+        # Nothing to do if this exact requirements.txt was installed before
+        req_hash = requirements_hash()
+        if stamp_is_current(req_hash):
+            self.log_message("Dependencies up to date", "SUCCESS")
+            return True
+            
+        # uv resolves and downloads in parallel, so try it before pip
+        if self.install_with_uv():
+            write_stamp(req_hash)
+            return True
+            
         try:
-            # Install/upgrade pip first
-            print("   📦 Upgrading pip...")
-            subprocess.run(
-                [str(python_path), "-m", "pip", "install", "--upgrade", "pip"],
-                capture_output=True,
-                timeout=60
-            )
+            # Install/upgrade pip first, at most once a week
+            if not _pip_recently_upgraded():
+                print("   📦 Upgrading pip...")
+                upgrade = _run_bounded(
+                    [str(self.venv_python), "-m", "pip", "install", "--upgrade", "pip"],
+                    timeout=60
+                )
+                if upgrade.returncode == 0:
+                    _write_stamp(PIP_UPGRADE_STAMP, "")
             
             # Install requirements
             print("   📦 Installing packages from requirements.txt...")
-            result = subprocess.run(
-                [str(pip_path), "install", "-r", "requirements.txt", "--timeout", "300"],
-                capture_output=True,
-                text=True,
+            result = _run_bounded(
+                [str(self.venv_pip), "install", "-r", "requirements.txt", "--timeout", "300"],
                 timeout=300
             )
             
             if result.returncode == 0:
                 self.log_message("Dependencies installed successfully", "SUCCESS")
+                write_stamp(req_hash)
             else:
                 self.log_message("Some dependency issues detected", "WARNING")
-                print(f"   Warning details: {result.stderr[:300]}...")
+                print(f"   Warning details: ...{result.stderr[-300:]}")
                 
-                # Try to install critical dependencies individually
+                # Try the critical dependencies together in one pip run
                 critical_deps = ["Flask", "webview", "requests"]
-                for dep in critical_deps:
-                    try:
-                        print(f"   🔧 Installing {dep} individually...")
-                        subprocess.run(
-                            [str(pip_path), "install", dep],
-                            capture_output=True,
-                            timeout=60,
-                            check=True
-                        )
-                        self.log_message(f"{dep} installed successfully", "SUCCESS")
-                    except Exception:
-                        self.log_message(f"Failed to install {dep}", "WARNING")
+                print(f"   🔧 Installing {', '.join(critical_deps)}...")
+                batch = _run_bounded(
+                    [str(self.venv_pip), "install", *critical_deps],
+                    timeout=120
+                )
+                if batch.returncode == 0:
+                    self.log_message("Critical dependencies installed successfully", "SUCCESS")
+                else:
+                    # Install them one at a time to see which one fails
+                    for dep in critical_deps:
+                        try:
+                            print(f"   🔧 Installing {dep} individually...")
+                            _run_bounded(
+                                [str(self.venv_pip), "install", dep],
+                                timeout=60,
+                                check=True
+                            )
+                            self.log_message(f"{dep} installed successfully", "SUCCESS")
+                        except Exception:
+                            self.log_message(f"Failed to install {dep}", "WARNING")
                 
         except subprocess.TimeoutExpired:
             self.log_message("Dependency installation timed out", "WARNING")
@@ -230,46 +479,73 @@ class ConsoleLauncher:
             self.log_message(f"Dependency installation error: {e}", "WARNING")
             print("   Continuing anyway - some packages may be missing")
         
-        time.sleep(1)
         return True
         
-    def check_tesseract(self):
-        """Check for Tesseract OCR."""
+    def find_uv(self):
+        """
+        Return the command prefix for running uv, or None if it is unavailable.
+
+        A uv on PATH is used directly; otherwise it is installed into the
+        venv as a single wheel and run as a module.
+        """
+        uv_path = shutil.which("uv")
+        if uv_path:
+            return [uv_path]
+        
+        print("   📦 Installing uv...")
+        try:
+            _run_bounded(
+                [str(self.venv_python), "-m", "pip", "install", "uv"],
+                check=True,
+                timeout=120
+            )
+            return [str(self.venv_python), "-m", "uv"]
+        except (OSError, subprocess.SubprocessError):
+            return None
+        
+    def install_with_uv(self):
+        """Install requirements.txt with uv. Returns False if pip should be used instead."""
+        uv_command = self.find_uv()
+        if uv_command is None:
+            return False
+            
+        print("   📦 Installing packages from requirements.txt with uv...")
+        try:
+            result = _run_bounded(
+                uv_command + ["pip", "install", "--python", str(self.venv_python),
+                              "-r", "requirements.txt"],
+                timeout=300
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            self.log_message(f"uv install failed: {e}", "WARNING")
+            return False
+            
+        if result.returncode != 0:
+            self.log_message("uv install failed, falling back to pip", "WARNING")
+            print(f"   Warning details: ...{result.stderr[-300:]}")
+            return False
+            
+        self.log_message("Dependencies installed successfully", "SUCCESS")
+        return True
+        
+    def check_tesseract(self, probe=None):
+        """
+        Report whether Tesseract OCR is installed.
+
+        Args:
+            probe (Future): A find_tesseract() call already running in the
+                background. Tesseract is looked up now if not given.
+        """
         self.update_progress(4, 6, "Checking Tesseract OCR...")
         
-        tesseract_paths = [
-            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe"
-        ]
-        
-        tesseract_found = False
-        for path in tesseract_paths:
-            if os.path.exists(path):
-                self.log_message(f"Tesseract found at: {path}", "SUCCESS")
-                tesseract_found = True
-                break
-                
-        if not tesseract_found:
-            # Try system PATH
-            try:
-                result = subprocess.run(
-                    ["tesseract", "--version"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    timeout=5
-                )
-                self.log_message("Tesseract found in system PATH", "SUCCESS")
-                tesseract_found = True
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-                
-        if not tesseract_found:
+        tesseract_path = probe.result() if probe else find_tesseract()
+        if tesseract_path:
+            self.log_message(f"Tesseract found at: {tesseract_path}", "SUCCESS")
+        else:
             self.log_message("Tesseract OCR not found", "WARNING")
             self.log_message("Download from: https://github.com/UB-Mannheim/tesseract/wiki", "WARNING")
             self.log_message("OCR functionality will be limited without Tesseract", "WARNING")
         
-        time.sleep(1)
         return True
         
     def start_server(self):
@@ -277,65 +553,79 @@ class ConsoleLauncher:
         self.update_progress(5, 6, "Starting application server...")
         
         try:
-            # Determine python executable path
-            if os.name == 'nt':  # Windows
-                python_path = Path("venv") / "Scripts" / "python.exe"
-            else:  # Unix-like
-                python_path = Path("venv") / "bin" / "python"
-            
-            if not python_path.exists():
-                self.log_message(f"Python not found at {python_path}", "ERROR")
+            if not self.venv_is_ready():
                 return False
                 
             if not Path("server.py").exists():
                 self.log_message("server.py not found", "ERROR")
                 return False
                 
-            self.server_process = subprocess.Popen(
-                [str(python_path), "server.py"],
+            self.server_process = _spawn(
+                [str(self.venv_python), "server.py"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
                 creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
             )
             
+            # Keep both pipes drained so the server never blocks on a full
+            # pipe; the last lines are kept for error reports
+            self._drain_threads = [
+                threading.Thread(target=_drain, args=(self.server_process.stdout, self._stdout_ring), daemon=True),
+                threading.Thread(target=_drain, args=(self.server_process.stderr, self._stderr_ring, self._server_wake), daemon=True),
+            ]
+            for thread in self._drain_threads:
+                thread.start()
+            
             self.log_message("Server process started, waiting for response...")
             
-            # Wait for server to be ready with robust checking
-            max_attempts = 30
+            # Wait for server to be ready. A TCP connect is cheap, so poll
+            # with it quickly at first and back off, and only send an HTTP
+            # request once the port is listening.
+            max_attempts = 35  # About 30 seconds in total
             for attempt in range(max_attempts):
                 # Check if process is still running
                 if self.server_process.poll() is not None:
                     # Process died, get error info
-                    stdout, stderr = self.server_process.communicate()
                     self.log_message("Server process died unexpectedly", "ERROR")
-                    if stderr:
-                        print(f"   Server error: {stderr[:300]}...")
+                    self.print_server_errors()
                     return False
                 
                 # Check if server is responding
-                if check_server_ready("http://127.0.0.1:5000", timeout=2):
+                if _tcp_ready("127.0.0.1", 5000) and check_server_ready("http://127.0.0.1:5000", timeout=2):
                     self.server_ready = True
                     self.log_message("Server is ready and responding!", "SUCCESS")
+                    threading.Thread(target=warm_up_server, daemon=True).start()
                     return True
                     
-                print(f"   ⏳ Waiting for server... ({attempt + 1}/{max_attempts})")
-                time.sleep(1)
+                delay = min(0.05 * (2 ** attempt), 1.0)
+                if delay >= 1.0:
+                    print(f"   ⏳ Waiting for server... ({attempt + 1}/{max_attempts})")
+                # Until the server prints its banner (or exits), wake up as
+                # soon as it does instead of sleeping out the whole delay
+                if self._server_wake.is_set():
+                    time.sleep(delay)
+                else:
+                    self._server_wake.wait(delay)
                 
             self.log_message("Server failed to respond within timeout", "ERROR")
-            # Get any error output
-            try:
-                stdout, stderr = self.server_process.communicate(timeout=2)
-                if stderr:
-                    print(f"   Server error: {stderr[:300]}...")
-            except:
-                pass
+            self.print_server_errors()
             return False
                 
         except Exception as e:
             self.log_message(f"Failed to start server: {e}", "ERROR")
             return False
             
+    def print_server_errors(self):
+        """Print the tail of the server's stderr collected by the drain threads."""
+        # A server that just exited may still have output in its pipe
+        if self.server_process.poll() is not None:
+            for thread in self._drain_threads:
+                thread.join(timeout=2)
+        stderr = "\n".join(self._stderr_ring)
+        if stderr:
+            print(f"   Server error: ...{stderr[-300:]}")
+            
     def launch_application(self):
         """Launch the main application UI with proper error handling."""
         if not self.server_ready:
@@ -347,7 +637,7 @@ class ConsoleLauncher:
         try:
             # Try to import webview with error handling
             try:
-                import webview
+                webview = self.get_webview()
             except ImportError as e:
                 self.log_message(f"WebView not available: {e}", "ERROR")
                 print("\n🌐 WebView not available, but you can still use the application!")
@@ -415,6 +705,12 @@ class ConsoleLauncher:
         """Run the complete setup and launch process."""
         print_banner()
         
+        # The Tesseract lookup does not depend on the venv, so it runs
+        # while the venv is created and dependencies are installed
+        probe_pool = ThreadPoolExecutor(max_workers=1)
+        tesseract_probe = probe_pool.submit(find_tesseract)
+        probe_pool.shutdown(wait=False)
+        
         try:
             print("\n🔧 Starting comprehensive setup process...")
             
@@ -427,7 +723,7 @@ class ConsoleLauncher:
             if not self.install_dependencies():
                 return False
                 
-            if not self.check_tesseract():
+            if not self.check_tesseract(tesseract_probe):
                 return False
                 
             if not self.start_server():
@@ -469,14 +765,17 @@ class ConsoleLauncher:
 class GUILauncher:
     """GUI-based launcher using tkinter with enhanced error handling."""
     
-    def __init__(self):
+    # Minimum seconds between full window updates from log_message
+    UPDATE_INTERVAL = 0.05
+    
+    def __init__(self, venv_process=None):
+        self.venv_process = venv_process
         try:
             import tkinter as tk
-            from tkinter import ttk, messagebox
+            from tkinter import ttk
             
             self.tk = tk
             self.ttk = ttk
-            self.messagebox = messagebox
             
             self.root = tk.Tk()
             self.setup_window()
@@ -486,6 +785,12 @@ class GUILauncher:
             print(f"Failed to initialize GUI: {e}")
             raise
         
+    @property
+    def messagebox(self):
+        """tkinter.messagebox, imported the first time an error dialog is shown."""
+        from tkinter import messagebox
+        return messagebox
+        
     def setup_window(self):
         """Configure the main window with Kyocera branding."""
         self.root.title("KYO QA Tool - Setup & Launcher")
@@ -511,7 +816,8 @@ class GUILauncher:
         self.total_steps = 6
         self.server_process = None
         self.server_ready = False
-        self.console_launcher = ConsoleLauncher()
+        self.last_update_ts = 0.0
+        self.console_launcher = ConsoleLauncher(self.venv_process)
         
     def setup_widgets(self):
         """Create and layout all widgets."""
@@ -639,12 +945,20 @@ class GUILauncher:
         
     def log_message(self, message):
         """Add a message to the log area."""
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = _timestamp()
         self.log_text.config(state=self.tk.NORMAL)
         self.log_text.insert(self.tk.END, f"[{timestamp}] {message}\n")
         self.log_text.config(state=self.tk.DISABLED)
         self.log_text.see(self.tk.END)
-        self.root.update()
+        
+        # A full update on every line is expensive during chatty steps, so
+        # in between only pending redraws are processed
+        now = time.monotonic()
+        if now - self.last_update_ts >= self.UPDATE_INTERVAL:
+            self.last_update_ts = now
+            self.root.update()
+        else:
+            self.root.update_idletasks()
         
     def update_progress(self, step, message):
         """Update progress bar and status."""
@@ -666,7 +980,7 @@ class GUILauncher:
     def launch_application(self):
         """Launch the webview application."""
         try:
-            import webview
+            webview = self.console_launcher.get_webview()
             self.log_message("Starting webview application...")
             webview.create_window(
                 'KYO QA ServiceNow Knowledge Tool',
@@ -706,9 +1020,13 @@ class GUILauncher:
                 import builtins
                 builtins.print = gui_print
                 
+                # Look for Tesseract in the background during venv setup
+                probe_pool = ThreadPoolExecutor(max_workers=1)
+                tesseract_probe = probe_pool.submit(find_tesseract)
+                probe_pool.shutdown(wait=False)
+                
                 self.update_progress(1, "Checking Python version...")
                 self.console_launcher.check_python_version()
-                time.sleep(1)
                 
                 self.update_progress(2, "Setting up virtual environment...")
                 if not self.console_launcher.setup_virtual_environment():
@@ -719,7 +1037,7 @@ class GUILauncher:
                     return
                 
                 self.update_progress(4, "Checking Tesseract OCR...")
-                self.console_launcher.check_tesseract()
+                self.console_launcher.check_tesseract(tesseract_probe)
                 
                 self.update_progress(5, "Starting server...")
                 if not self.console_launcher.start_server():
@@ -753,6 +1071,17 @@ class GUILauncher:
 def main():
     """Main entry point - choose between GUI and console launcher."""
     try:
+        # Creating the venv is the longest first-run step and needs nothing
+        # else, so start it before anything is checked or printed
+        venv_process = None
+        if not Path("venv").exists():
+            venv_process = _spawn(
+                [sys.executable, "-m", "venv", "venv"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+        
         print("🚀 KYO QA Tool Enhanced Launcher")
         print("   Checking system capabilities...")
         
@@ -760,16 +1089,19 @@ def main():
         if check_gui_availability():
             print("✅ GUI available - starting visual launcher...")
             try:
-                launcher = GUILauncher()
+                launcher = GUILauncher(venv_process)
                 launcher.run()
             except Exception as e:
                 print(f"❌ GUI launcher failed: {e}")
                 print("🔄 Falling back to console launcher...")
-                launcher = ConsoleLauncher()
+                # Hand over the venv process unless the GUI already waited for it
+                if venv_process is not None and venv_process.returncode is not None:
+                    venv_process = None
+                launcher = ConsoleLauncher(venv_process)
                 launcher.run()
         else:
             print("🖥️  Using console launcher...")
-            launcher = ConsoleLauncher()
+            launcher = ConsoleLauncher(venv_process)
             launcher.run()
             
     except KeyboardInterrupt:
@@ -10,6 +10,8 @@ import subprocess
 import os
 from pathlib import Path
 
+from setup_stamp import requirements_hash, stamp_is_current, write_stamp
+
 VENV_DIR = "venv"
 REQUIREMENTS_FILE = "requirements.txt"
 LAUNCH_SCRIPT = "launch.py"
@@ -38,10 +40,16 @@ def setup_environment():
             print(f"--- FATAL ERROR: Failed to create virtual environment. {e} ---")
             sys.exit(1)
     
+    req_hash = requirements_hash()
+    if stamp_is_current(req_hash):
+        print("--- Dependencies unchanged since last install. ---")
+        return
+
     print("--- Installing/updating dependencies... ---")
     try:
         pip_executable = get_python_executable().replace('python.exe', 'pip.exe') if is_windows() else get_python_executable().replace('python', 'pip')
-        subprocess.check_call([pip_executable, "install", "--upgrade", "-r", REQUIREMENTS_FILE])
+        subprocess.check_call([pip_executable, "install", "--require-virtualenv", "--upgrade-strategy", "only-if-needed", "--prefer-binary", "-r", REQUIREMENTS_FILE])
+        write_stamp(req_hash)
         print("--- Dependencies are up to date. ---")
     except subprocess.CalledProcessError as e:
         print(f"--- FATAL ERROR: Failed to install dependencies. {e} ---")
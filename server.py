@@ -3,18 +3,34 @@
 # Date: 2025-07-19
 # Version: 30.2.0
 
+import io
 import os
+import hashlib
+import re
+import time
+import uuid
 import shutil
 import tempfile
 import zipfile
 import logging
-from pathlib import Path
-from flask import Flask, request, abort, send_file, render_template, jsonify
+import threading
+from flask import Flask, Response, request, abort, send_file, jsonify
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
+
+# streaming-form-data is optional; it parses uploads as they arrive
+# instead of letting Werkzeug spool the whole request first
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import BaseTarget
+except ImportError:
+    StreamingFormDataParser = None
+    BaseTarget = object
 
 from backend import start_processing_job, get_job_status
 from custom_patterns import get_pattern_strings, save_patterns
 from config import ensure_directories
+from file_utils import list_zip_pdfs
 
 # Initialize directories
 ensure_directories()
@@ -27,101 +43,353 @@ app = Flask(__name__, template_folder="web", static_folder="web", static_url_pat
 # Increase the maximum file upload size to 1 GB
 app.config['MAX_CONTENT_LENGTH'] = 1024 * 1024 * 1024 
 
-# Global variable to store the current job ID
-current_job_id = None
-final_output_path = None
+# index.html has no template variables, so it is read once and served as
+# is, with an ETag so the browser can revalidate without downloading it
+with open(os.path.join(app.root_path, "web", "index.html"), "rb") as f:
+    _INDEX_HTML = f.read()
+_INDEX_ETAG = hashlib.md5(_INDEX_HTML).hexdigest()
 
 @app.route("/")
 def index():
     """Serve the main HTML page."""
-    return render_template("index.html")
+    if request.if_none_match.contains(_INDEX_ETAG):
+        response = Response(status=304)
+    else:
+        response = Response(_INDEX_HTML, mimetype="text/html")
+    response.set_etag(_INDEX_ETAG)
+    # Always revalidate, so a new index.html is picked up on the next load
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
-@app.route("/api/process", methods=["POST"])
-def api_process():
-    """Process uploaded files."""
-    global current_job_id, final_output_path
-    current_job_id = None
-    final_output_path = None
+# Uploads are read from the request body in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+class _UploadTarget(BaseTarget):
+    """Streams each uploaded file of one form field into the work directory."""
+    
+    def __init__(self, workdir, description):
+        super().__init__()
+        self.workdir = workdir
+        self.description = description
+        self.paths = []
+        self._file = None
+    
+    def on_start(self):
+        filename = secure_filename(self.multipart_filename or "")
+        if filename:
+            path = os.path.join(self.workdir, filename)
+            self._file = open(path, "wb")
+            self.paths.append(path)
+    
+    def on_data_received(self, chunk):
+        if self._file:
+            self._file.write(chunk)
+    
+    def on_finish(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            logger.info(f"Saved {self.description}: {os.path.basename(self.paths[-1])}")
+
+class _ExcelTarget(BaseTarget):
+    """Keeps the uploaded Excel template in memory; it is small and never reread from disk."""
+    
+    def __init__(self):
+        super().__init__()
+        self.buffer = None
+    
+    def on_start(self):
+        self.buffer = io.BytesIO() if self.multipart_filename else None
+    
+    def on_data_received(self, chunk):
+        if self.buffer:
+            self.buffer.write(chunk)
+    
+    def on_finish(self):
+        if self.buffer:
+            self.buffer.seek(0)
+            logger.info(f"Received Excel template: {self.multipart_filename}")
+
+def _receive_uploads(workdir):
+    """
+    Read the uploaded Excel template and save the PDF/ZIP files into workdir.
+
+    With streaming-form-data installed, the multipart body is parsed as it
+    is read and each file goes straight to its final path. Otherwise
+    Werkzeug parses the whole request first, spooling large files to
+    temporary files, and they are copied over. The Excel template is kept
+    in memory either way.
+
+    Args:
+        workdir (str): Directory to save the files in.
+
+    Returns:
+        tuple: (BytesIO with the Excel template or None, list of uploaded file paths)
+    """
+    if StreamingFormDataParser is not None and request.mimetype == "multipart/form-data":
+        excel_target = _ExcelTarget()
+        files_target = _UploadTarget(workdir, "uploaded file")
+        parser = StreamingFormDataParser(headers=request.headers)
+        parser.register("excel", excel_target)
+        parser.register("pdfs[]", files_target)
+        while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+            parser.data_received(chunk)
+        return excel_target.buffer, files_target.paths
     
     excel = request.files.get("excel")
-    uploaded_files = request.files.getlist("pdfs[]")
+    excel_buffer = None
+    if excel and excel.filename:
+        excel_buffer = io.BytesIO(excel.read())
+        logger.info(f"Received Excel template: {excel.filename}")
     
-    if not excel or not uploaded_files:
+    uploaded_paths = []
+    for f in request.files.getlist("pdfs[]"):
+        filename = secure_filename(f.filename)
+        if not filename:
+            continue
+        file_path = os.path.join(workdir, filename)
+        f.save(file_path)
+        uploaded_paths.append(file_path)
+        logger.info(f"Saved uploaded file: {filename}")
+    return excel_buffer, uploaded_paths
+
+def _start_job(workdir, excel, uploaded_paths):
+    """
+    Validate the files saved in workdir and start a processing job on them.
+
+    Args:
+        workdir (str): Directory holding the uploaded files.
+        excel: The Excel template as a path or in-memory buffer, or None if missing.
+        uploaded_paths (list): Paths of the uploaded PDF/ZIP files.
+
+    Returns:
+        Response: JSON response with the started job's ID.
+    """
+    if excel is None or not uploaded_paths:
         logger.warning("Missing Excel template or PDF/ZIP files in request")
         return abort(400, "Missing Excel template or PDF/ZIP files.")
+    
+    # Process uploaded files (PDFs and ZIPs of PDFs)
+    pdf_paths = []
+    for file_path in uploaded_paths:
+        filename = os.path.basename(file_path)
 
+        if filename.lower().endswith('.zip'):
+            # ZIPs are extracted by the processing job in the background,
+            # so only check here that there is something to process.
+            # This reads the archive's directory, not its contents.
+            try:
+                if list_zip_pdfs(file_path):
+                    pdf_paths.append(file_path)
+                else:
+                    logger.info(f"No PDF files in ZIP file: {filename}")
+            except zipfile.BadZipFile:
+                logger.warning(f"Skipped corrupted ZIP file: {filename}")
+                continue
+                
+        elif filename.lower().endswith('.pdf'):
+            pdf_paths.append(file_path)
+
+    if not pdf_paths:
+        logger.warning("No PDF files found in uploaded files")
+        return abort(400, "No PDF files found in the selection or ZIP archives.")
+
+    logger.info(f"Starting processing job with {len(pdf_paths)} PDF/ZIP file(s)")
+    job_id = start_processing_job(pdf_paths, workdir)
+    
+    return jsonify({"status": "started", "job_id": job_id})
+
+@app.route("/api/process", methods=["POST"])
+def api_process():
+    """Process uploaded files."""
     # Create temporary directory for uploaded files
     workdir = tempfile.mkdtemp(prefix="qa_tool_")
     logger.info(f"Created temporary directory: {workdir}")
     
     try:
-        # Save Excel template
-        excel_path = os.path.join(workdir, secure_filename(excel.filename))
-        excel.save(excel_path)
-        logger.info(f"Saved Excel template: {excel.filename}")
+        excel, uploaded_paths = _receive_uploads(workdir)
+        return _start_job(workdir, excel, uploaded_paths)
         
-        # Process uploaded files (PDFs and ZIPs)
-        pdf_paths = []
-        for f in uploaded_files:
-            filename = secure_filename(f.filename)
-            file_path = os.path.join(workdir, filename)
-            f.save(file_path)
-            logger.info(f"Saved uploaded file: {filename}")
-
-            if filename.lower().endswith('.zip'):
-                # Extract PDFs from ZIP
-                try:
-                    with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                        for member in zip_ref.namelist():
-                            if (member.lower().endswith('.pdf') and 
-                                not member.startswith('__MACOSX') and
-                                not member.startswith('.DS_Store')):
-                                
-                                # Create safe filename for extracted PDF
-                                base_name = Path(filename).stem
-                                pdf_name = Path(member).name
-                                extracted_filename = f"{base_name}_{pdf_name}"
-                                extracted_path = os.path.join(workdir, extracted_filename)
-                                
-                                # Extract the file
-                                with zip_ref.open(member) as source, open(extracted_path, "wb") as target:
-                                    shutil.copyfileobj(source, target)
-                                pdf_paths.append(extracted_path)
-                                logger.info(f"Extracted PDF: {pdf_name} from {filename}")
-                                
-                except zipfile.BadZipFile:
-                    logger.warning(f"Skipped corrupted ZIP file: {filename}")
-                    continue
-                    
-            elif filename.lower().endswith('.pdf'):
-                pdf_paths.append(file_path)
-
-        if not pdf_paths:
+    except HTTPException:
+        if os.path.exists(workdir):
             shutil.rmtree(workdir)
-            logger.warning("No PDF files found in uploaded files")
-            return abort(400, "No PDF files found in the selection or ZIP archives.")
-
-        logger.info(f"Starting processing job with {len(pdf_paths)} PDF files")
-        current_job_id = start_processing_job(pdf_paths)
-        
-        return jsonify({"status": "started", "job_id": current_job_id})
-        
+        raise
     except Exception as e:
         logger.error(f"Error in api_process: {e}", exc_info=True)
         if os.path.exists(workdir):
             shutil.rmtree(workdir)
         return abort(500, f"Server error: {e}")
 
+# Chunked uploads: the client opens a session, PUTs the Excel template and
+# then each file in pieces with a Content-Range header, then asks for the
+# session to be processed. A failed piece is retried on its own instead of
+# restarting the upload. Like /api/process, the template is kept in memory
+# and the PDF/ZIP files are written to the session's work directory.
+_upload_sessions = {}
+_sessions_lock = threading.Lock()
+CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+# Sessions idle for longer than this are dropped with their files
+UPLOAD_SESSION_TTL = 60 * 60
+
+# The template is held in memory, so it is capped well below MAX_CONTENT_LENGTH
+MAX_TEMPLATE_SIZE = 50 * 1024 * 1024
+
+def _expire_sessions():
+    """Remove upload sessions that have been idle for longer than the TTL."""
+    cutoff = time.monotonic() - UPLOAD_SESSION_TTL
+    with _sessions_lock:
+        expired = [sid for sid, s in _upload_sessions.items() if s["last_used"] < cutoff]
+        sessions = [_upload_sessions.pop(sid) for sid in expired]
+    for session in sessions:
+        shutil.rmtree(session["workdir"], ignore_errors=True)
+        logger.info(f"Expired idle upload session: {session['workdir']}")
+
+def _get_session(session_id):
+    """Return an upload session and mark it as used, or abort with 404."""
+    with _sessions_lock:
+        session = _upload_sessions.get(session_id)
+        if session:
+            session["last_used"] = time.monotonic()
+    if not session:
+        abort(404, "Unknown upload session.")
+    return session
+
+@app.route("/api/upload", methods=["POST"])
+def api_upload_session():
+    """Open a chunked upload session."""
+    _expire_sessions()
+    session_id = uuid.uuid4().hex
+    workdir = tempfile.mkdtemp(prefix="qa_tool_")
+    with _sessions_lock:
+        _upload_sessions[session_id] = {
+            "workdir": workdir,
+            "last_used": time.monotonic(),
+            "excel": None,
+            # Sanitized name -> (name sent by the client, total size)
+            "files": {},
+            # Sanitized name -> lock held while a chunk is checked and written
+            "locks": {},
+        }
+    logger.info(f"Created upload session {session_id}: {workdir}")
+    return jsonify({"session_id": session_id})
+
+@app.route("/api/template/<session_id>", methods=["PUT"])
+def api_upload_template(session_id):
+    """Store the Excel template of an upload session in memory."""
+    session = _get_session(session_id)
+    if request.content_length is not None and request.content_length > MAX_TEMPLATE_SIZE:
+        return abort(413, "Excel template is too large.")
+    
+    data = request.stream.read(MAX_TEMPLATE_SIZE + 1)
+    if not data:
+        return abort(400, "Empty Excel template.")
+    if len(data) > MAX_TEMPLATE_SIZE:
+        return abort(413, "Excel template is too large.")
+    session["excel"] = io.BytesIO(data)
+    logger.info(f"Received Excel template for upload session {session_id}")
+    return jsonify({"status": "ok"})
+
+@app.route("/api/upload/<session_id>/<filename>", methods=["PUT"])
+def api_upload_chunk(session_id, filename):
+    """
+    Append one chunk of a file to an upload session.
+
+    The chunk's position is given by a "Content-Range: bytes start-end/total"
+    header. The body must be exactly end - start + 1 bytes and must start
+    where the file on disk currently ends; otherwise 409 is returned with
+    the offset to resume from. Without the header the body is taken as the
+    whole file.
+    """
+    session = _get_session(session_id)
+    original_name = filename
+    filename = secure_filename(filename)
+    if not filename:
+        return abort(400, "Invalid filename.")
+    path = os.path.join(session["workdir"], filename)
+    
+    content_range = request.headers.get("Content-Range")
+    if content_range:
+        match = CONTENT_RANGE_RE.fullmatch(content_range.strip())
+        if not match:
+            return abort(400, "Invalid Content-Range header.")
+        start, end, total = (int(g) for g in match.groups())
+        length = end - start + 1
+        if end < start or end >= total or request.content_length != length:
+            return abort(400, "Content-Range does not match the request body.")
+    else:
+        start, total = 0, request.content_length
+        length = total
+    
+    # Two different uploads must not end up in the same file, e.g. names
+    # that only differ in characters secure_filename replaces
+    with _sessions_lock:
+        known = session["files"].setdefault(filename, (original_name, total))
+        file_lock = session["locks"].setdefault(filename, threading.Lock())
+    if known != (original_name, total):
+        return abort(400, f"A different file named {filename} was already uploaded.")
+    
+    # Overlapping requests for the same file (e.g. a client retry while the
+    # first attempt is still sending) are serialized from the offset check
+    # through the write, so only one of them can append its chunk
+    with file_lock:
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        if start != offset:
+            return jsonify({"offset": offset}), 409
+        
+        with open(path, "ab") as f:
+            written = 0
+            while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                written += len(chunk)
+            if length is not None and written != length:
+                # The body was cut short; drop the partial chunk so the client
+                # can resend it from the same offset
+                f.truncate(start)
+                return abort(400, "Request body ended early.")
+            offset = f.tell()
+    
+    complete = total is None or offset >= total
+    if complete:
+        logger.info(f"Saved uploaded file: {filename}")
+    return jsonify({"offset": offset, "complete": complete})
+
+@app.route("/api/process/<session_id>", methods=["POST"])
+def api_process_session(session_id):
+    """Process the files uploaded to a chunked upload session."""
+    session = _get_session(session_id)
+    with _sessions_lock:
+        _upload_sessions.pop(session_id, None)
+    workdir = session["workdir"]
+    
+    try:
+        uploaded_paths = []
+        for name, (_, total) in sorted(session["files"].items()):
+            path = os.path.join(workdir, name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if total is not None and size != total:
+                logger.warning(f"Skipped incomplete upload: {name} ({size}/{total} bytes)")
+                continue
+            uploaded_paths.append(path)
+        return _start_job(workdir, session["excel"], uploaded_paths)
+        
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as e:
+        logger.error(f"Error in api_process_session: {e}", exc_info=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+        return abort(500, f"Server error: {e}")
+
 @app.route("/api/status")
 def api_status():
-    """Get the status of the current processing job."""
-    global current_job_id, final_output_path
-    
-    if not current_job_id:
+    """Get the status of the processing job given by the job_id query parameter."""
+    job_id = request.args.get("job_id")
+    if not job_id:
         return jsonify([])
     
     try:
-        status = get_job_status(current_job_id)
+        status = get_job_status(job_id)
         if not status:
             return jsonify([])
         
@@ -160,7 +428,6 @@ def api_status():
         # Add finish status
         if status.get('status') == 'complete':
             messages.append({"type": "finish", "status": "Complete"})
-            # Note: Excel file path would be handled differently in this version
         elif status.get('status') == 'error':
             messages.append({"type": "finish", "status": "Error"})
         
@@ -172,10 +439,22 @@ def api_status():
 
 @app.route("/api/get-result")
 def api_get_result():
-    """Download the result file."""
-    # This would need to be implemented based on how the excel_generator 
-    # saves files in the current version
-    return abort(404, "Result download not implemented in this version.")
+    """Download the Excel report of the job given by the job_id query parameter."""
+    status = get_job_status(request.args.get("job_id", ""))
+    report_path = status.get("report_path") if status else None
+    if not report_path or not os.path.exists(report_path):
+        return abort(404, "No result available for this job.")
+    
+    # conditional=True answers Range/If-None-Match requests itself, and the
+    # file is handed to the WSGI server's file wrapper (sendfile where
+    # supported) instead of being read into Python
+    return send_file(
+        report_path,
+        as_attachment=True,
+        conditional=True,
+        etag=True,
+        max_age=0,
+    )
 
 @app.route('/api/patterns', methods=['GET', 'POST'])
 def handle_patterns():
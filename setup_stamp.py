@@ -0,0 +1,58 @@
+# setup_stamp.py
+# Author: Kenneth Walker
+# Date: 2025-07-19
+# Version: 30.2.0
+
+"""Stamp file recording the last successful dependency install, shared by all launchers."""
+
+import sys
+import hashlib
+from pathlib import Path
+
+REQUIREMENTS_FILE = "requirements.txt"
+
+# Holds requirements_hash() from the last successful install
+STAMP_FILE = Path("venv") / ".req_hash"
+
+def requirements_hash():
+    """
+    Hash requirements.txt together with the running Python version.
+
+    Returns:
+        str: The hex digest, or None if requirements.txt cannot be read.
+    """
+    try:
+        data = Path(REQUIREMENTS_FILE).read_bytes() + sys.version.encode()
+    except OSError:
+        return None
+    return hashlib.blake2b(data).hexdigest()
+
+def stamp_is_current(req_hash=None, newer_than=()):
+    """
+    Return True if STAMP_FILE matches req_hash (by default the current hash).
+
+    Args:
+        req_hash (str): Hash to compare against.
+        newer_than (iterable): Paths the stamp must not be older than, such
+            as the launcher script, so an edited launcher re-runs setup.
+    """
+    req_hash = req_hash or requirements_hash()
+    if req_hash is None:
+        return False
+    try:
+        stamp_mtime = STAMP_FILE.stat().st_mtime
+        if any(stamp_mtime < Path(path).stat().st_mtime for path in newer_than):
+            return False
+        return STAMP_FILE.read_text(errors="ignore").strip() == req_hash
+    except OSError:
+        return False
+
+def write_stamp(req_hash=None):
+    """Record req_hash (by default the current hash); failures only mean the next run does more work."""
+    req_hash = req_hash or requirements_hash()
+    if req_hash is None:
+        return
+    try:
+        STAMP_FILE.write_text(req_hash)
+    except OSError:
+        pass
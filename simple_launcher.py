@@ -6,8 +6,16 @@
 import os
 import sys
 import time
+import socket
+import threading
 import subprocess
+import importlib.util
+import importlib.machinery
+import urllib.request
 from pathlib import Path
+from collections import deque
+
+from setup_stamp import requirements_hash, stamp_is_current, write_stamp
 
 def print_header():
     """Print header with progress indicator."""
@@ -75,6 +83,46 @@ def setup_venv():
     time.sleep(1)
     return True
 
+def pip_is_outdated(python_path, minimum=24):
+    """Return True when the venv's pip major version is below ``minimum``."""
+    try:
+        result = subprocess.run(
+            [str(python_path), "-m", "pip", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        # Output looks like "pip 24.0 from ... (python 3.11)"
+        major = result.stdout.split()[1].split(".")[0]
+        return int(major) < minimum
+    except Exception:
+        return True
+
+INSTALL_LOG = Path("venv") / "install.log"
+
+def run_logged(args, timeout):
+    """
+    Run a command with its output written to venv/install.log.
+
+    pip can print megabytes of progress and build output; sending it to a
+    file keeps it out of the launcher's memory and avoids a full pipe.
+
+    Returns:
+        subprocess.CompletedProcess: The finished process (no output attached)
+    """
+    with open(INSTALL_LOG, "ab") as log_file:
+        return subprocess.run(args, stdout=log_file, stderr=subprocess.STDOUT, timeout=timeout)
+
+def install_log_tail(size=200):
+    """Return the last size characters of venv/install.log."""
+    try:
+        with open(INSTALL_LOG, "rb") as log_file:
+            log_file.seek(0, os.SEEK_END)
+            log_file.seek(max(0, log_file.tell() - size))
+            return log_file.read().decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+
 def install_dependencies():
     """Install dependencies with robust error handling."""
     log_step(3, 7, "Installing dependencies", "RUNNING")
@@ -91,45 +139,53 @@ def install_dependencies():
         log_step(3, 7, f"Pip not found at {pip_path}", "ERROR")
         return False
     
+    # Skip pip entirely when requirements.txt and Python are unchanged
+    req_hash = requirements_hash()
+    if stamp_is_current(req_hash):
+        log_step(3, 7, "Dependencies unchanged since last install", "SUCCESS")
+        return True
+    
     print("    Installing packages... (this may take 2-3 minutes)")
+    print(f"    Output is written to {INSTALL_LOG}")
+    INSTALL_LOG.write_bytes(b"")
     
     try:
-        # Upgrade pip first
-        print("    📦 Upgrading pip...")
-        subprocess.run(
-            [str(python_path), "-m", "pip", "install", "--upgrade", "pip"],
-            capture_output=True,
-            timeout=60
-        )
+        # Upgrade pip only when it is too old to resolve wheels reliably
+        if pip_is_outdated(python_path):
+            print("    📦 Upgrading pip...")
+            run_logged(
+                [str(python_path), "-m", "pip", "install", "--upgrade", "pip"],
+                timeout=60
+            )
         
         # Install from requirements.txt
         print("    📦 Installing from requirements.txt...")
-        result = subprocess.run(
-            [str(pip_path), "install", "-r", "requirements.txt", "--timeout", "300"],
-            capture_output=True,
-            text=True,
+        result = run_logged(
+            [str(pip_path), "install", "--require-virtualenv",
+             "--upgrade-strategy", "only-if-needed", "--prefer-binary",
+             "-r", "requirements.txt", "--timeout", "300"],
             timeout=300
         )
         
         if result.returncode == 0:
+            write_stamp(req_hash)
             log_step(3, 7, "Dependencies installed successfully", "SUCCESS")
         else:
             log_step(3, 7, "Some dependency issues, installing critical packages individually", "WARNING")
-            print(f"    Warning details: {result.stderr[:200]}")
+            print(f"    Warning details: {install_log_tail()}")
             
             # Install critical dependencies individually
-            critical_deps = ["Flask>=2.0", "webview", "requests", "Pillow", "PyMuPDF", "pandas", "pytesseract"]
+            critical_deps = ["Flask>=2.0", "webview", "requests", "Pillow", "PyMuPDF", "pytesseract"]
             success_count = 0
             
             for dep in critical_deps:
                 try:
                     print(f"    🔧 Installing {dep}...")
-                    result = subprocess.run(
-                        [str(pip_path), "install", dep],
-                        capture_output=True,
-                        timeout=60,
-                        check=True
+                    result = run_logged(
+                        [str(pip_path), "install", "--require-virtualenv", "--prefer-binary", dep],
+                        timeout=60
                     )
+                    result.check_returncode()
                     success_count += 1
                     print(f"    ✅ {dep} installed")
                 except Exception:
@@ -167,21 +223,33 @@ def check_critical_dependencies():
         "PIL": "PIL"
     }
     
+    # One venv interpreter checks every module with find_spec, printing
+    # "module:1" or "module:0" per line, instead of one import per process
+    modules = list(critical_imports.values())
+    script = (
+        "import importlib.util\n"
+        f"for m in {modules!r}:\n"
+        "    print(m + ':' + ('1' if importlib.util.find_spec(m) else '0'))"
+    )
+    found = {}
+    try:
+        result = subprocess.run(
+            [str(python_path), "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        for line in result.stdout.splitlines():
+            module, _, flag = line.partition(":")
+            found[module] = flag == "1"
+    except Exception:
+        pass
+    
     available = {}
     for name, module in critical_imports.items():
-        try:
-            result = subprocess.run(
-                [str(python_path), "-c", f"import {module}; print('OK')"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            available[name] = result.returncode == 0
-            status = "✅" if available[name] else "❌"
-            print(f"    {status} {name}")
-        except Exception:
-            available[name] = False
-            print(f"    ❌ {name}")
+        available[name] = found.get(module, False)
+        status = "✅" if available[name] else "❌"
+        print(f"    {status} {name}")
     
     # Check if we have enough to run
     required_count = sum(available.values())
@@ -211,8 +279,8 @@ def check_tesseract():
     # Check system PATH
     if not tesseract_found:
         try:
-            subprocess.run(["tesseract", "--version"], 
-                         capture_output=True, timeout=5, check=True)
+            subprocess.run(["tesseract", "--version"], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=5, check=True)
             tesseract_found = True
         except:
             pass
@@ -227,6 +295,59 @@ def check_tesseract():
     time.sleep(1)
     return True
 
+def _port_open(host, port, timeout=0.5):
+    """Return True if a TCP connection to host:port is accepted."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+def _http_ok(url, timeout=2):
+    """Return True if a GET of url answers with HTTP 200."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+# Startup lines printed by Werkzeug, gunicorn and waitress once listening
+READY_BANNERS = ("Running on", "Listening at", "Serving on")
+
+def _watch_output(stream, lines, ready):
+    """Read a server pipe to EOF, keeping recent lines and setting ready on a startup banner."""
+    for line in stream:
+        lines.append(line)
+        if any(banner in line for banner in READY_BANNERS):
+            ready.set()
+
+def server_command(python_path):
+    """
+    Build the command that runs the Flask app.
+
+    A production WSGI server with threads is preferred, so uploads and
+    status polls are served side by side: gunicorn, or waitress on Windows
+    where gunicorn does not run. Without either, server.py starts the
+    Werkzeug development server.
+
+    There must be a single worker process, because jobs are tracked in
+    that process's memory.
+
+    Args:
+        python_path (Path): The venv's Python interpreter.
+
+    Returns:
+        list: The command line to start.
+    """
+    if os.name == 'nt':
+        if venv_has_module("waitress"):
+            return [str(python_path), "-m", "waitress", "--threads=8",
+                    "--listen=127.0.0.1:5000", "server:app"]
+    elif venv_has_module("gunicorn"):
+        return [str(python_path), "-m", "gunicorn", "-w", "1", "-k", "gthread",
+                "--threads", "8", "-b", "127.0.0.1:5000", "server:app"]
+    return [str(python_path), "server.py"]
+
 def start_server():
     """Start the Flask server with robust error handling."""
     log_step(6, 7, "Starting Flask server", "RUNNING")
@@ -248,7 +369,7 @@ def start_server():
     
     try:
         server_process = subprocess.Popen(
-            [str(python_path), "server.py"],
+            server_command(python_path),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
@@ -257,67 +378,44 @@ def start_server():
         
         print("    Waiting for server to start...")
         
-        # Wait for server to be ready with multiple checking methods
-        max_attempts = 30
+        # Reader threads keep the pipes drained, remember the last lines of
+        # output and signal as soon as the server prints its startup banner
+        ready = threading.Event()
+        output = deque(maxlen=20)
+        readers = [
+            threading.Thread(target=_watch_output, args=(stream, output, ready), daemon=True)
+            for stream in (server_process.stdout, server_process.stderr)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        # Wait up to 30 seconds, waking every 200 ms to check the process
+        max_attempts = 150
         for attempt in range(max_attempts):
+            banner = ready.wait(0.2)
+            
             # Check if process is still running
             if server_process.poll() is not None:
-                # Process died, get error info
-                stdout, stderr = server_process.communicate()
+                for reader in readers:
+                    reader.join(timeout=1)
                 log_step(6, 7, "Server process died unexpectedly", "ERROR")
-                if stderr:
-                    print(f"    Server error: {stderr[:300]}...")
-                elif stdout:
-                    print(f"    Server output: {stdout[:300]}...")
+                if output:
+                    print(f"    Server output: {''.join(output)[-300:]}...")
                 return None
             
-            # Try multiple methods to check server readiness
-            server_ready = False
-            
-            # Method 1: Try with requests if available
-            try:
-                result = subprocess.run(
-                    [str(python_path), "-c", "import requests; r=requests.get('http://127.0.0.1:5000', timeout=2); print('OK' if r.status_code==200 else 'FAIL')"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0 and "OK" in result.stdout:
-                    server_ready = True
-            except:
-                pass
-            
-            # Method 2: Try with urllib (built-in)
-            if not server_ready:
-                try:
-                    result = subprocess.run(
-                        [str(python_path), "-c", "import urllib.request; urllib.request.urlopen('http://127.0.0.1:5000', timeout=2); print('OK')"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if result.returncode == 0 and "OK" in result.stdout:
-                        server_ready = True
-                except:
-                    pass
-            
-            if server_ready:
+            # Confirm with one HTTP request once the banner is out; the port
+            # is also probed each second in case the banner is never printed
+            if (banner or attempt % 5 == 4) and _port_open("127.0.0.1", 5000) \
+                    and _http_ok("http://127.0.0.1:5000"):
                 log_step(6, 7, "Server started successfully", "SUCCESS")
                 return server_process
-                    
-            print(f"    ⏳ Checking server... ({attempt + 1}/{max_attempts})")
-            time.sleep(1)
+            
+            if attempt % 5 == 4:
+                print(f"    ⏳ Checking server... ({attempt + 1}/{max_attempts})")
         
         log_step(6, 7, "Server failed to respond within timeout", "ERROR")
-        # Get any error output
-        try:
-            stdout, stderr = server_process.communicate(timeout=2)
-            if stderr:
-                print(f"    Server error: {stderr[:300]}...")
-            elif stdout:
-                print(f"    Server output: {stdout[:300]}...")
-        except:
-            pass
+        if output:
+            print(f"    Server output: {''.join(output)[-300:]}...")
         
         # Terminate the non-responsive server
         server_process.terminate()
@@ -327,6 +425,31 @@ def start_server():
         log_step(6, 7, f"Failed to start server: {e}", "ERROR")
         return None
 
+WINDOW_TITLE = 'KYO QA ServiceNow Knowledge Tool'
+
+# Run by the venv interpreter when the launcher itself cannot import webview
+WEBVIEW_SCRIPT = f'''
+import sys
+import webview
+
+try:
+    webview.create_window({WINDOW_TITLE!r}, 'http://127.0.0.1:5000', width=1200, height=800, resizable=True)
+    webview.start(debug=False)
+    print("Application closed normally")
+except Exception as e:
+    print(f"WebView error: {{e}}")
+    sys.exit(1)
+'''
+
+def venv_has_module(name):
+    """Check whether a module is installed in the venv, without starting its interpreter."""
+    if os.name == 'nt':
+        site_dirs = [Path("venv") / "Lib" / "site-packages"]
+    else:
+        site_dirs = list((Path("venv") / "lib").glob("python*/site-packages"))
+    paths = [str(d) for d in site_dirs if d.is_dir()]
+    return bool(paths) and importlib.machinery.PathFinder.find_spec(name, paths) is not None
+
 def launch_webview(server_process):
     """Launch the webview application with fallback options."""
     log_step(7, 7, "Launching application", "RUNNING")
@@ -344,51 +467,22 @@ def launch_webview(server_process):
     
     # Try webview first
     try:
-        # Check if webview is available
-        result = subprocess.run(
-            [str(python_path), "-c", "import webview; print('OK')"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        if importlib.util.find_spec("webview") is not None:
+            # This interpreter has webview (e.g. the launcher runs from the
+            # venv), so open the window here without another process
+            print("   Starting application window...")
+            import webview
+            webview.create_window(WINDOW_TITLE, 'http://127.0.0.1:5000', width=1200, height=800, resizable=True)
+            webview.start(debug=False)
+            log_step(7, 7, "Application launched successfully", "SUCCESS")
+            print("\n👋 Application closed by user")
+            return True
         
-        if result.returncode == 0:
+        if venv_has_module("webview"):
             print("   Starting application window...")
-            
-            # Create a simple webview launcher script
-            launcher_script = '''
-import webview
-import sys
-
-try:
-    webview.create_window(
-        'KYO QA ServiceNow Knowledge Tool',
-        'http://127.0.0.1:5000',
-        width=1200,
-        height=800,
-        resizable=True
-    )
-    webview.start(debug=False)
-    print("Application closed normally")
-except Exception as e:
-    print(f"WebView error: {e}")
-    sys.exit(1)
-'''
-            
-            # Write and run the launcher
-            with open("temp_launcher.py", "w") as f:
-                f.write(launcher_script)
-            
             try:
-                result = subprocess.run([str(python_path), "temp_launcher.py"], timeout=None)
+                subprocess.run([str(python_path), "-c", WEBVIEW_SCRIPT], timeout=None)
                 log_step(7, 7, "Application launched successfully", "SUCCESS")
-                
-                # Clean up
-                try:
-                    os.remove("temp_launcher.py")
-                except:
-                    pass
-                    
                 print("\n👋 Application closed by user")
                 return True
                 
@@ -401,8 +495,11 @@ except Exception as e:
         else:
             print("   WebView not available, trying browser option...")
             
+    except KeyboardInterrupt:
+        print("\n👋 Application cancelled by user")
+        return True
     except Exception as e:
-        print(f"   WebView check failed: {e}")
+        print(f"   WebView failed: {e}")
     
     # Fallback to browser
     log_step(7, 7, "WebView unavailable, using browser fallback", "WARNING")
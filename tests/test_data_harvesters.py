@@ -0,0 +1,74 @@
+# tests/test_data_harvesters.py
+# Author: Kenneth Walker
+# Date: 2025-07-19
+# Version: 30.2.0
+
+import pytest
+
+import data_harvesters
+from custom_patterns import DEFAULT_PATTERNS, _compile_patterns
+
+
+@pytest.fixture
+def use_patterns(monkeypatch):
+    """Point find_patterns at the given patterns, using the re path."""
+    def apply(model_patterns, qa_patterns=()):
+        monkeypatch.setattr(data_harvesters, "_MODEL_RES", _compile_patterns(model_patterns, "model"))
+        monkeypatch.setattr(data_harvesters, "_QA_RES", _compile_patterns(qa_patterns, "QA"))
+        monkeypatch.setattr(data_harvesters, "_HS", None)
+    return apply
+
+
+def test_overlapping_hits_from_different_patterns(use_patterns):
+    use_patterns([r"\bFS-\d+", r"\bFS-\d+[A-Z]*\b"])
+    result = data_harvesters.find_patterns("Applies to the FS-1020D printer.")
+    assert result["models"] == "FS-1020, FS-1020D"
+
+
+def test_inline_flags_keep_user_patterns(use_patterns):
+    use_patterns([r"(?i)fs-\d+", r"\bKM-\d+\b"], [r"(?i)qa-\d+"])
+    result = data_harvesters.find_patterns("FS-1020 and KM-2540, see qa-77")
+    assert result["models"] == "FS-1020, KM-2540"
+    assert result["qa_numbers"] == "qa-77"
+
+
+def test_capture_group_contributes_first_group(use_patterns):
+    use_patterns([r"Model:\s*(\w+-\d+)"])
+    result = data_harvesters.find_patterns("Model: TA-3050 is affected")
+    assert result["models"] == "TA-3050"
+
+
+def test_short_text_is_still_searched(use_patterns):
+    use_patterns([r"\bFS-\d+\b"], [r"\bQA-\d+\b"])
+    assert data_harvesters.find_patterns("QA-1234")["qa_numbers"] == "QA-1234"
+
+
+def test_blank_text_without_filename_finds_nothing(use_patterns):
+    use_patterns([r"\bFS-\d+\b"], [r"\bQA-\d+\b"])
+    result = data_harvesters.find_patterns("  \n ")
+    assert result == {"models": "Not Found", "author": "", "qa_numbers": ""}
+
+
+@pytest.mark.parametrize("model_patterns, qa_patterns, text", [
+    ([r"\d{5}"], [r"\bQA-\d+\b"], "Ref 1234567 and QA-12 QA-345"),
+    ([r"\bFS-\d+[A-Z]*\b", r"\bKM-\d+\b"], [r"\bSB-\d+\b"], "FS-1020D FS-1020 KM-2540KM-1 SB-9"),
+    ([r"[A-Z]{2}-\d+"], [r"\d\d"], "AB-1234CD-56 9876 12 3"),
+    (DEFAULT_PATTERNS["model_patterns"], DEFAULT_PATTERNS["qa_patterns"],
+     "Modèle: KM-2560é, Gerät FS-1020DÜ"),
+    ([r"\w+-\d+"], [r"\bQA-\d+\b"], "Ä-12 and QA-7"),
+    ([r"FS|FS-\d+"], [r"QA-\d+?"], "FS-1020 QA-123"),
+    ([r"(\w)-\1"], [r"\bSB-\d+\b"], "a-a b-c SB-1"),
+])
+def test_hyperscan_matches_re(monkeypatch, model_patterns, qa_patterns, text):
+    pytest.importorskip("hyperscan")
+    from custom_patterns import _build_hyperscan_database
+    
+    database = _build_hyperscan_database(model_patterns, qa_patterns)
+    assert database is not None
+    monkeypatch.setattr(data_harvesters, "_HS", database)
+    hs_models, hs_qas = data_harvesters._scan_hyperscan(text, text.lower())
+    
+    re_models = data_harvesters._scan_re(_compile_patterns(model_patterns, "model"), text, text.lower())
+    re_qas = data_harvesters._scan_re(_compile_patterns(qa_patterns, "QA"), text, text.lower())
+    assert hs_models == re_models
+    assert hs_qas == re_qas
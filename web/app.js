@@ -36,6 +36,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const patternStatus = document.getElementById('pattern-status');
 
     let statusInterval;
+    let currentJobId = null;
     let statusCounters = {};
 
     // --- Event Listeners ---
@@ -67,14 +68,29 @@ document.addEventListener('DOMContentLoaded', () => {
         e.preventDefault();
         resetUI();
         
-        const formData = new FormData(form);
+        const excelFile = document.getElementById('excel-file').files[0];
+        const files = Array.from(pdfFilesInput.files);
         startButton.disabled = true;
-        startButton.textContent = 'Processing...';
+        startButton.textContent = 'Uploading...';
         progressContainer.style.display = 'block';
 
         try {
-            const response = await fetch('/api/process', { method: 'POST', body: formData });
+            const session = await fetch('/api/upload', { method: 'POST' });
+            if (!session.ok) {
+                throw new Error(await session.text());
+            }
+            const { session_id } = await session.json();
+            const template = await fetch(`/api/template/${session_id}`, { method: 'PUT', body: excelFile });
+            if (!template.ok) {
+                throw new Error(`Upload of ${excelFile.name} failed: ${await template.text()}`);
+            }
+            for (const file of files) {
+                await uploadFile(session_id, file);
+            }
+            startButton.textContent = 'Processing...';
+            const response = await fetch(`/api/process/${session_id}`, { method: 'POST' });
             if (response.ok) {
+                currentJobId = (await response.json()).job_id;
                 statusInterval = setInterval(checkStatus, 1000);
             } else {
                 logMessage(`Error starting job: ${await response.text()}`, 'error');
@@ -86,8 +102,46 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Files are sent in pieces so a failed request only resends one piece
+    const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+    const UPLOAD_RETRIES = 3;
+
+    async function uploadFile(sessionId, file) {
+        const url = `/api/upload/${sessionId}/${encodeURIComponent(file.name)}`;
+        if (file.size === 0) {
+            const response = await fetch(url, { method: 'PUT', body: file });
+            if (!response.ok) {
+                throw new Error(`Upload of ${file.name} failed: ${await response.text()}`);
+            }
+            return;
+        }
+        let offset = 0;
+        let failures = 0;
+        while (offset < file.size) {
+            const end = Math.min(offset + UPLOAD_CHUNK_SIZE, file.size);
+            try {
+                const response = await fetch(url, {
+                    method: 'PUT',
+                    headers: { 'Content-Range': `bytes ${offset}-${end - 1}/${file.size}` },
+                    body: file.slice(offset, end),
+                });
+                if (response.ok || response.status === 409) {
+                    // 409 means the server has a different offset; resume there
+                    offset = (await response.json()).offset;
+                    failures = 0;
+                    continue;
+                }
+                throw new Error(await response.text());
+            } catch (error) {
+                if (++failures > UPLOAD_RETRIES) {
+                    throw new Error(`Upload of ${file.name} failed: ${error.message}`);
+                }
+            }
+        }
+    }
+
     function checkStatus() {
-        fetch('/api/status')
+        fetch(`/api/status?job_id=${encodeURIComponent(currentJobId)}`)
             .then(response => response.json())
             .then(messages => messages.forEach(handleMessage));
     }
@@ -115,7 +169,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 statusText.textContent = `Job ${msg.status}!`;
                 if (msg.status === 'Complete') {
                     resultLinkContainer.style.display = 'block';
-                    resultLink.href = '/api/get-result';
+                    resultLink.href = `/api/get-result?job_id=${encodeURIComponent(currentJobId)}`;
                 }
                 startButton.disabled = false;
                 startButton.textContent = 'Start Processing';